@@ -3,6 +3,30 @@ ABSTRACT SYNTAX TREE
 This file contains the Python class that defines the abstract syntax tree (AST) representation.
 '''
 
+
+class ErrorSignature:
+    '''
+    Class to represent the output signature of a program whose output on some input is undefined (e.g.,
+    due to division by zero), or whose evaluation raises an error. All such programs share the single
+    instance ERROR as their output signature, so that they form one equivalence class, regardless of
+    their outputs on other inputs. Since a parent of such a program is undefined on the same input, no
+    such program can be part of a program that satisfies the input-output examples.
+    '''
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "ERROR"
+
+    def __reduce__(self):
+        # unpickle to the same instance (e.g., in worker processes), so that it can be compared by identity
+        return "ERROR"
+
+
+# output signature of all programs with an undefined output
+ERROR = ErrorSignature()
+
+
 class OperatorNode:
     '''
     Class to represent operator nodes (i.e., an operator and its operands) as an AST.
@@ -23,30 +47,76 @@ class OperatorNode:
 
         add_node = OperatorNode(Add(), [IntegerVariable(0), IntegerConstant(5)])
         multiply_node.evaluate([7]) # returns 24
+
+        To evaluate over all inputs at once, the evaluate_vector() method caches the output vector
+        of each node, so that parent nodes are evaluated from the cached outputs of their children:
+
+        multiply_node.evaluate_vector([[7], [9]]) # returns (24, 28)
+
+        If the output of a program is undefined on any input (i.e., an operator returns None or raises
+        an error), evaluate_vector() returns the error signature ERROR instead of an output vector.
+
+    Since the program bank may hold millions of nodes, nodes use __slots__ rather than a per-instance
+    dictionary, and children are stored as a tuple, which takes a bare node (with its children tuple) from
+    about 169 to about 140 bytes. Only the output vector is cached, since it is needed to evaluate parent
+    nodes and is shared with the signature table of the bank. The string representation is built on demand,
+    as it is only needed to print a program. The arity of the operator is checked once, when the node is
+    constructed. To evaluate a finished program many times, compile it into a Python function with
+    compile_program() in compilation.py.
     '''
 
+    __slots__ = ("operator", "children", "weight", "type", "values")
+
     def __init__(self, operator, children):
+
+        # check arity of operator in AST
+        # note that children cannot change after construction, so the arity is only checked once
+        if len(children) != operator.arity:
+            raise ValueError("Invalid number of operands for operator")
+
         self.operator = operator  # operator object (e.g., Add, Subtract, etc.)
-        self.children = children  # list of children nodes (operands)
+        self.children = tuple(children)  # tuple of children nodes (operands)
         self.weight = operator.weight + sum([child.weight for child in children])  # weight of the program
         self.type = operator.return_type  # return type of the operator object
+        self.values = None  # cached output vector of the program on the example inputs
 
     def evaluate(self, input = None):
 
-        # check arity of operator in AST
-        if len(self.children) != self.operator.arity:
-            raise ValueError("Invalid number of operands for operator")
-        
         # recursively evaluate the operator and its operands
+        # if any operand is undefined (i.e., None), so is the output
         operands = [child.evaluate(input) for child in self.children]
+        if None in operands:
+            return None
         return self.operator.evaluate(*operands, input)
 
+    def evaluate_vector(self, inputs):
+
+        # return cached output vector if already computed
+        # note that the cache assumes the same inputs are used throughout a search
+        if self.values is not None:
+            return self.values
+
+        # the output of a program with an undefined child is undefined
+        child_vectors = [child.evaluate_vector(inputs) for child in self.children]
+        if any([vector is ERROR for vector in child_vectors]):
+            self.values = ERROR
+            return self.values
+
+        # apply the operator elementwise to the cached output vectors of the children
+        # note that operators are evaluated without the input, which no operator of the DSLs uses
+        try:
+            self.values = tuple(map(self.operator.evaluate, *child_vectors))
+        except Exception:
+            self.values = ERROR
+            return self.values
+
+        # collapse output vectors with an undefined output into the error signature
+        if None in self.values:
+            self.values = ERROR
+        return self.values
+
     def str(self):
 
-        # check arity of operator in AST
-        if len(self.children) != self.operator.arity:
-            raise ValueError("Invalid number of operands for operator")
-        
         # recursively generate a string representation of the AST
         operand_strings = [child.str() for child in self.children]
         return self.operator.str(*operand_strings)
\ No newline at end of file
@@ -3,7 +3,6 @@ import streamlit as st
 # standard imports
 import numpy as np
 import argparse
-import itertools
 import time
 import ast
 
@@ -13,8 +12,21 @@ from strings import *
 from abstract_syntax_tree import *
 from examples import *
 from synthesis import *
+from background_search import SearchCache
 import config
 
+
+# GET BACKGROUND SEARCHES
+@st.cache_resource(show_spinner = False)
+def get_searches():
+    '''
+    Returns the background searches, which are shared by every rerun of the script and every session of
+    the app. At most config.APP_CACHE_ENTRIES searches are kept, and evicted searches are stopped.
+    '''
+    return SearchCache(config.APP_CACHE_ENTRIES, cache_dir = config.CACHE_DIR,
+                       max_bank_size = config.APP_MAX_BANK_SIZE, lease = config.APP_SEARCH_LEASE)
+
+
 # write streamlit title
 st.title("Bottom-Up Program Synthesis")
 
@@ -63,89 +75,34 @@ else:
     # retrieve selected input-output examples
     examples = example_set[examples_key]
 
-# extract constants from examples
+# run synthesis engine in the background, so that the page stays responsive
+# the search is shared by every maximum weight, so moving the slider reuses earlier results
 st.subheader("Synthesis Steps")
-program_bank = extract_constants(examples)
-program_bank_str = [p.str() for p in program_bank]
-print("\nSynthesis Log:")
-print(f"- Extracted {len(program_bank)} constants from examples.")
-st.markdown(f"* Extracted {len(program_bank)} constants from examples.")
-
-# define operators
-if domain == "arithmetic":
-    operators = arithmetic_operators
-elif domain == "strings":
-    operators = string_operators
-# else:
-#     raise Exception('Domain not recognized. Must be either "arithmetic" or "string".')
-
-# define final program
-final_program = None
-
-start_time = time.time()
-# iterate over each level
-for weight in range(2, max_weight):
-
-    # print message
-    print(f"- Searching level {weight} with {len(program_bank)} primitives.")
-    st.markdown(f"* Searching level {weight} with {len(program_bank)} primitives.")
-
-    # iterate over each operator
-    for op in operators:
-
-        # get all possible combinations of primitives in program bank
-        combinations = itertools.combinations(program_bank, op.arity)
-
-        # iterate over each combination
-        for combination in combinations:
-
-            # get type signature
-            type_signature = [p.type for p in combination]
+search = get_searches().get(domain, examples)
+search.request(max_weight)
+status = search.status(max_weight)
 
-            # check if type signature matches operator
-            if type_signature != op.arg_types:
-                continue
+# show progress of the search
+for message in search.messages():
+    st.markdown(f"* {message}")
 
-            # check that sum of weights of arguments <= w
-            if sum([p.weight for p in combination]) > weight:
-                continue
-
-            # create new program
-            program = OperatorNode(op, combination)
-
-            # check if program is in program bank using string representation
-            if program.str() in program_bank_str:
-                continue
-            
-            # check if program is observationally equivalent to any program in program bank
-            if any([observationally_equivalent(program, p, examples) for p in program_bank]):
-                continue
-
-            # add program to program bank
-            program_bank.append(program)
-            program_bank_str.append(program.str())
+# check if program was found
+st.subheader("Synthesis Results")
+final_program = search.program
+if status == "running":
+    st.write(f":hourglass_flowing_sand: Searching for a program of weight at most {max_weight}...")
 
-            # check if program passes all examples
-            if check_program(program, examples):
-                final_program = program
+elif status == "error":
+    st.write(f":x: Synthesis failed: {search.error}")
 
-end_time = time.time()
-elapsed_time = round(end_time - start_time, 4)
+elif status == "not found":
+    st.write(f":x: Max weight of {max_weight} reached, no program found.")
 
-# check if program was found
-print("\nSynthesis Results:")
-st.subheader("Synthesis Results")
-if final_program is None:
-    print(f"- Max weight of {max_weight} reached, no program found in {elapsed_time}s.")
+elif status == "incomplete":
+    st.write(f":x: Program bank limit reached at level {search.full_weight}, no program found up to that level.")
 
-    st.write(f":x: Max weight of {max_weight} reached, no program found in {elapsed_time}s.")
 else:
-    print(f"- Program found in {elapsed_time}s.")
-    print(f"- Program: {final_program.str()}")
-    print(f"- Program weight: {final_program.weight}")
-    print(f"- Program return type: {final_program.type.__name__}")
-
-    st.write(f":white_check_mark: Program found in {elapsed_time}s.")
+    st.write(f":white_check_mark: Program found in {search.elapsed_time}s.")
     st.markdown(f"Program: `{final_program.str()}`")
     st.markdown(f"Weight: `{final_program.weight}`")
     st.markdown(f"Return Type: `{final_program.type.__name__}`")
@@ -176,4 +133,9 @@ st.header("📖 References")
 
 st.markdown('''
 1. Odena, A. *et al.* [BUSTLE: Bottom-Up Program Synthesis Through Learning-Guided Exploration.](https://arxiv.org/abs/2007.14381) in *9th International Conference on Learning Representations*; 2021 May 3-7; Austria.
-''')
\ No newline at end of file
+''')
+
+# rerun the script while the search is running, to stream its progress to the page
+if status == "running":
+    time.sleep(config.APP_REFRESH_INTERVAL)
+    st.experimental_rerun()
@@ -12,10 +12,13 @@ class IntegerVariable:
     Class to represent an integer variable. Note that position is the position of the variable in the input.
     For example, if the input is [4, 5, 6] and the variable is the third element (i.e., 6), then position = 2.
     '''
+    __slots__ = ("position", "type", "weight", "values")
+
     def __init__(self, position):
         self.position = position    # zero-indexed position of the variable in the arguments to program
         self.type = int             # type of the variable
         self.weight = 1             # weight of the variable
+        self.values = None          # cached output vector on the example inputs
 
     def evaluate(self, input = None):
 
@@ -36,6 +39,11 @@ class IntegerVariable:
             raise ValueError(f"Position {self.position} is out of range for input of length {len(input)}.")
 
         return input[self.position]
+
+    def evaluate_vector(self, inputs):
+        if self.values is None:
+            self.values = tuple([self.evaluate(input) for input in inputs])
+        return self.values
     
     def str(self):
         return f"x{self.position}"
@@ -44,13 +52,21 @@ class IntegerConstant:
     '''
     Class to represent an integer constant.
     '''
+    __slots__ = ("value", "type", "weight", "values")
+
     def __init__(self, value):
         self.value = value  # value of the constant
         self.type = int     # type of the constant
         self.weight = 1     # weight of the constant
+        self.values = None  # cached output vector on the example inputs
 
     def evaluate(self, input = None):
         return self.value
+
+    def evaluate_vector(self, inputs):
+        if self.values is None:
+            self.values = tuple([self.value for input in inputs])
+        return self.values
     
     def str(self):
         return str(self.value)
@@ -59,15 +75,27 @@ class Add:
     '''
     Operator to add two numerical values.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [int, int]     # argument types
+        self.arg_types = (int, int)     # argument types
         self.return_type = int          # return type
         self.weight = 1                 # weight
+        self.commutative = True         # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         return x + y
+
+    def evaluate_vectorized(self, x, y):
+        return x + y
     
+    def inverse(self, output, operand, position):
+        return output - operand
+
+    def compile(self, x, y):
+        return f"({x} + {y})"
+
     def str(self, x, y):
         return f"({x} + {y})"
 
@@ -75,15 +103,27 @@ class Subtract:
     '''
     Operator to subtract two numerical values.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [int, int]     # argument types
+        self.arg_types = (int, int)     # argument types
         self.return_type = int          # return type
         self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         return x - y
+
+    def evaluate_vectorized(self, x, y):
+        return x - y
     
+    def inverse(self, output, operand, position):
+        return operand - output if position == 0 else output + operand
+
+    def compile(self, x, y):
+        return f"({x} - {y})"
+
     def str(self, x, y):
         return f"({x} - {y})"
     
@@ -91,15 +131,24 @@ class Multiply:
     '''
     Operator to multiply two numerical values.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [int, int]     # argument types
+        self.arg_types = (int, int)     # argument types
         self.return_type = int          # return type
         self.weight = 1                 # weight
+        self.commutative = True         # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         return x * y
+
+    def evaluate_vectorized(self, x, y):
+        return x * y
     
+    def compile(self, x, y):
+        return f"({x} * {y})"
+
     def str(self, x, y):
         return f"({x} * {y})" 
 
@@ -107,18 +156,96 @@ class Divide:
     '''
     Operator to divide two numerical values.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [int, int]     # argument types
+        self.arg_types = (int, int)     # argument types
         self.return_type = int          # return type
         self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         try: # check for division by zero error
             return x / y
         except ZeroDivisionError:
             return None
-    
+
+    def evaluate_vectorized(self, x, y):
+        return x / y
+
+    def compile(self, x, y):
+        return f"({x} / {y})"
+
+    def compile_guard(self, x, y):
+        return f"{y} != 0"
+
+    def str(self, x, y):
+        return f"({x} / {y})"
+
+class FloorDivide:
+    '''
+    Operator to divide two integer values, rounding down, so that the output is an integer.
+    '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
+    def __init__(self):
+        self.arity = 2                  # number of arguments
+        self.arg_types = (int, int)     # argument types
+        self.return_type = int          # return type
+        self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
+
+    def evaluate(self, x, y, input = None):
+        if y == 0: # check for division by zero
+            return None
+        return x // y
+
+    def evaluate_vectorized(self, x, y):
+        return x // (y + (y == 0))
+
+    def defined_vectorized(self, x, y):
+        return y != 0
+
+    def compile(self, x, y):
+        return f"({x} // {y})"
+
+    def compile_guard(self, x, y):
+        return f"{y} != 0"
+
+    def str(self, x, y):
+        return f"({x} // {y})"
+
+class ExactDivide:
+    '''
+    Operator to divide two integer values, whose output is only defined if the division is exact.
+    '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
+    def __init__(self):
+        self.arity = 2                  # number of arguments
+        self.arg_types = (int, int)     # argument types
+        self.return_type = int          # return type
+        self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
+
+    def evaluate(self, x, y, input = None):
+        if y == 0 or x % y != 0: # check for division by zero or inexact division
+            return None
+        return x // y
+
+    def evaluate_vectorized(self, x, y):
+        return x // (y + (y == 0))
+
+    def defined_vectorized(self, x, y):
+        return (y != 0) & (x % (y + (y == 0)) == 0)
+
+    def compile(self, x, y):
+        return f"({x} // {y})"
+
+    def compile_guard(self, x, y):
+        return f"{y} != 0 and {x} % {y} == 0"
+
     def str(self, x, y):
         return f"({x} / {y})"
 
@@ -128,4 +255,7 @@ GLOBAL CONSTANTS
 ''' 
 
 # define operators
-arithmetic_operators = [Add(), Subtract(), Multiply(), Divide()]
\ No newline at end of file
+arithmetic_operators = [Add(), Subtract(), Multiply(), Divide()]
+
+# define division operators of each division mode, which replace Divide in arithmetic_operators
+division_operators = {"true": Divide(), "floor": FloorDivide(), "exact": ExactDivide()}
\ No newline at end of file
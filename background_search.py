@@ -0,0 +1,223 @@
+'''
+BACKGROUND SEARCH
+This file contains the Python class that runs the synthesis engine for a set of input-output examples in a
+background thread, so that an interactive front end (e.g., the Streamlit app) can show the progress of a
+search without blocking on it.
+
+The results of a search are reused for every maximum weight: if a program of weight w was found, it is the
+result for any maximum weight of at least w, and if no program was found up to weight m, there is none for
+any maximum weight of at most m. A deeper search continues from the program bank cached on disk by the
+shallower search (see bank_cache.py), rather than starting over from weight 2.
+
+A running search holds a lease, which is renewed whenever a weight with an unknown result is requested.
+Since the app reruns while a search is running, the lease expires soon after nobody is waiting for the
+search (e.g., once the slider is moved back to a weight with a known result), and the search is then
+stopped by the synthesis engine. Searches are kept in a SearchCache, which stops evicted searches.
+'''
+
+# load libraries
+import collections
+import threading
+import time
+
+# import synthesizer
+from synthesis import synthesize, get_operators
+from search_options import SearchOptions, Deadline
+
+
+class BackgroundSearch:
+    '''
+    Class to represent the search for a program satisfying a set of input-output examples, run in a
+    background thread. The methods of this class are thread-safe, so that a single search can be
+    shared by every session of the app.
+
+    Args:
+        domain (str): domain of synthesis (either "arithmetic" or "strings")
+        examples (list): list of tuples, where each tuple is of the form (input, output)
+        cache_dir (str): directory in which to cache the program bank
+        max_bank_size (int): maximum number of programs to store in the program bank
+        lease (float): number of seconds after the last request for an unknown result at which the search stops
+
+    Example:
+        search = BackgroundSearch("arithmetic", example_set["addition"])
+        search.request(3)
+        while search.status(3) == "running":
+            time.sleep(0.1)
+        search.program.str() # returns "(x0 + x1)"
+    '''
+
+    def __init__(self, domain, examples, cache_dir = None, max_bank_size = None, lease = 5.0):
+        self.domain = domain                    # domain of synthesis
+        self.examples = examples                # input-output examples
+        self.cache_dir = cache_dir              # directory in which to cache the program bank
+        self.max_bank_size = max_bank_size      # maximum number of programs in the program bank
+        self.lease = lease                      # number of seconds for which a request keeps the search running
+        self.stop = Deadline(lease)             # stop flag of the search, renewed by requests
+        self.closed = False                     # whether the search was closed, e.g., on eviction
+        self.lock = threading.Lock()            # lock guarding the attributes below
+        self.thread = None              # background thread, or None if no search is running
+        self.max_weight = 1             # maximum weight requested so far
+        self.exhausted = 1              # maximum weight up to which no program exists
+        self.full_weight = None         # weight at which the program bank limit was reached, if any
+        self.program = None             # smallest program found, if any
+        self.elapsed_time = None        # time from the start of the search to the program
+        self.log = []                   # list of progress messages
+        self.error = None               # error raised by the search, if any
+
+    def request(self, max_weight):
+        '''
+        Request a search up to max_weight. If the result for max_weight is not yet known, the lease of the
+        search is renewed, and a background thread is started, or the running thread continues to max_weight
+        once its current search ends.
+        '''
+
+        with self.lock:
+            if self.closed or self.status_locked(max_weight) != "running":
+                return
+            self.stop.renew(self.lease)
+            self.max_weight = max(self.max_weight, max_weight)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def close(self):
+        '''
+        Stop the running search, if any, and ignore later requests.
+        '''
+
+        with self.lock:
+            self.closed = True
+            self.stop.renew(0)
+
+    def status(self, max_weight):
+        '''
+        Returns the status of the search up to max_weight, i.e., "found" if a program of weight at most
+        max_weight was found, "not found" if no such program exists, "incomplete" if the program bank limit
+        was reached before max_weight, "error" if the search failed, and "running" otherwise.
+        '''
+
+        with self.lock:
+            return self.status_locked(max_weight)
+
+    def status_locked(self, max_weight):
+        if self.program is not None and self.program.weight <= max_weight:
+            return "found"
+        if self.exhausted >= max_weight:
+            return "not found"
+        if self.full_weight is not None and self.thread is None:
+            return "incomplete"
+        if self.error is not None:
+            return "error"
+        return "running"
+
+    def messages(self):
+        '''
+        Returns a copy of the progress messages of the search.
+        '''
+
+        with self.lock:
+            return list(self.log)
+
+    def run(self):
+        '''
+        Run the search in the background thread until the result for the maximum weight requested is known.
+        '''
+
+        start_time = time.time()
+        while True:
+
+            # search up to the maximum weight requested, resuming from the cached program bank, until the
+            # lease of the search expires (the engine checks the stop flag before each candidate)
+            with self.lock:
+                max_weight = self.max_weight
+            options = SearchOptions(cache_dir = self.cache_dir, max_bank_size = self.max_bank_size, stop = self.stop)
+            try:
+                for event in synthesize(self.examples, get_operators(self.domain), max_weight, options):
+                    with self.lock:
+                        self.record(event, max_weight, start_time)
+            except Exception as error:
+                with self.lock:
+                    self.error = error
+                    self.thread = None
+                return
+
+            # stop if the search was stopped, or unless a deeper search was requested in the meantime
+            with self.lock:
+                if event["stopped"] or self.program is not None or self.max_weight == max_weight:
+                    self.thread = None
+                    return
+
+    def record(self, event, max_weight, start_time):
+        '''
+        Record an event of the synthesis engine.
+        '''
+
+        if event["event"] == "start":
+            self.log.append(f"Extracted {event['constants']} constants from examples.")
+
+        elif event["event"] == "cache":
+            self.log.append(f"Loaded {event['bank_size']} primitives up to level {event['weight']} from cache.")
+
+        elif event["event"] == "bank_full":
+            self.log.append(f"Program bank limit reached at level {event['weight']}, so the search is incomplete.")
+            self.full_weight = event["weight"]
+
+        # levels are only complete up to the level at which the program bank limit was reached, since the
+        # candidates of later levels are built from a partial bank
+        elif event["event"] == "level":
+            self.log.append(f"Searching level {event['weight']} with {event['bank_size']} primitives.")
+            if self.program is None and (self.full_weight is None or event["weight"] - 1 <= self.full_weight):
+                self.exhausted = max(self.exhausted, event["weight"] - 1)
+
+        elif event["event"] == "solution":
+            self.program = event["program"]
+            self.elapsed_time = round(time.time() - start_time, 4)
+            self.exhausted = max(self.exhausted, self.program.weight - 1)
+
+        elif event["event"] == "done" and event["stopped"]:
+            self.log.append("Search stopped, as no session is waiting for it.")
+
+        elif event["event"] == "done" and self.program is None:
+            if self.full_weight is None:
+                self.exhausted = max(self.exhausted, max_weight)
+            self.elapsed_time = round(time.time() - start_time, 4)
+
+
+class SearchCache:
+    '''
+    Class to represent the background searches shared by every session of the app, keyed by domain and
+    examples (rather than the maximum weight, as a search serves every maximum weight). The least recently
+    used searches are evicted and stopped once max_entries searches are kept.
+
+    Args:
+        max_entries (int): maximum number of searches kept
+        **options: options passed to each BackgroundSearch (i.e., cache_dir, max_bank_size, and lease)
+
+    Example:
+        searches = SearchCache(32, cache_dir = config.CACHE_DIR)
+        search = searches.get("arithmetic", example_set["addition"])
+    '''
+
+    def __init__(self, max_entries, **options):
+        self.max_entries = max_entries
+        self.options = options
+        self.lock = threading.Lock()
+        self.searches = collections.OrderedDict()   # dictionary mapping key to search in least recently used order
+
+    def get(self, domain, examples):
+        '''
+        Returns the search for a domain and set of input-output examples, creating it if needed.
+        '''
+
+        key = (domain, repr(examples))
+        with self.lock:
+            if key in self.searches:
+                self.searches.move_to_end(key)
+                return self.searches[key]
+
+            search = BackgroundSearch(domain, examples, **self.options)
+            self.searches[key] = search
+            while len(self.searches) > self.max_entries:
+                _, evicted = self.searches.popitem(last=False)
+                evicted.close()
+            return search
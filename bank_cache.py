@@ -0,0 +1,164 @@
+'''
+PROGRAM BANK CACHE
+This file contains functions to save and load the program bank to and from disk, so that a search can
+resume from the deepest level enumerated by an earlier search with the same inputs and operators.
+
+Since programs are only pruned by observational equivalence on the example inputs, the program bank
+after each complete level depends only on the example inputs, the operators, and the enumeration mode,
+and not on the example outputs. Each cached bank is therefore stored in a directory named by a hash of
+these, and contains the following files:
+
+    meta.json: the completed weight, the operator names, the constants and variables of the bank,
+        and any additional search state (e.g., the position of a checkpoint within a level)
+    opcodes.npy: int16 array with the index of the operator of each program, or -1 for leaves
+    children.npy: int32 array of shape (programs, max arity) with the bank indices of the children
+        of each program, padded with -1
+
+The arrays are memory-mapped when loaded, and the output vectors of programs are recomputed from the
+example inputs, since each program is evaluated from the cached output vectors of its children.
+'''
+
+# load libraries
+import numpy as np
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# import AST and program bank
+from arithmetic import IntegerConstant, IntegerVariable
+from strings import StringConstant, StringVariable
+from abstract_syntax_tree import OperatorNode
+from program_bank import ProgramBank
+
+# version of the cached program banks, incremented when the programs stored in a bank change
+# (e.g., since programs with undefined outputs are no longer stored)
+CACHE_VERSION = 2
+
+# classes of constants and variables that can be cached
+leaf_classes = {cls.__name__: cls for cls in [IntegerConstant, IntegerVariable, StringConstant, StringVariable]}
+
+
+# GET CACHE PATH
+def bank_key(operators, examples, complete = False, max_magnitude = None, goals = None):
+    '''
+    Returns the cache key of a program bank, i.e., a hash of the operators, the example inputs,
+    the enumeration mode, the magnitude cap, and the target outputs of a goal-directed search.
+    '''
+
+    description = {
+        "version": CACHE_VERSION,
+        "operators": [(type(op).__name__, op.weight) for op in operators],
+        "inputs": [example[0] for example in examples],
+        "complete": complete,
+        "max_magnitude": max_magnitude,
+        "goals": goals,
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def cache_path(cache_dir, operators, examples, complete = False, max_magnitude = None, goals = None):
+    '''
+    Returns the directory in which the program bank for these operators and examples is cached.
+    '''
+    return Path(cache_dir) / bank_key(operators, examples, complete, max_magnitude, goals)
+
+
+# SAVE PROGRAM BANK
+def save_bank(path, bank, operators, weight, state = None):
+    '''
+    Save the program bank to a directory, recording that all levels up to weight are complete. Any
+    additional JSON-serializable search state (e.g., for checkpoints) can be passed as state. The bank
+    is written to a temporary directory unique to this save, which then replaces the existing directory,
+    so that an interrupted save does not corrupt an earlier cache, and concurrent searches with the same
+    inputs (e.g., in the app or the server) do not write over each other. If another search replaces the
+    directory first, this save is dropped.
+    '''
+
+    path = Path(path)
+    index = {id(program): i for i, program in enumerate(bank.programs)}
+    op_index = {id(op): i for i, op in enumerate(operators)}
+    max_arity = max([op.arity for op in operators])
+
+    # encode each program as its operator index and the bank indices of its children
+    opcodes = np.full(len(bank), -1, dtype=np.int16)
+    children = np.full((len(bank), max_arity), -1, dtype=np.int32)
+    leaves = []
+    for i, program in enumerate(bank.programs):
+        if isinstance(program, OperatorNode):
+            opcodes[i] = op_index[id(program.operator)]
+            children[i, :len(program.children)] = [index[id(child)] for child in program.children]
+        else:
+            value = program.position if hasattr(program, "position") else program.value
+            leaves.append([type(program).__name__, value])
+
+    meta = {
+        "weight": weight,
+        "operators": [type(op).__name__ for op in operators],
+        "leaves": leaves,
+        "size": len(bank),
+        "state": state,
+    }
+
+    # write to a unique temporary directory, then replace existing directory
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = Path(tempfile.mkdtemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent))
+    try:
+        np.save(temp_path / "opcodes.npy", opcodes)
+        np.save(temp_path / "children.npy", children)
+        with open(temp_path / "meta.json", "w") as f:
+            json.dump(meta, f)
+
+        # os.replace fails if another search wrote the directory after it was removed, in which case
+        # the bank of the other search is kept
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(temp_path, path)
+    except OSError:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+
+# LOAD PROGRAM BANK
+def load_bank(path, examples, operators):
+    '''
+    Load a program bank from a directory. Returns a tuple (bank, weight, state), where weight is the
+    deepest complete level in the cached bank and state is the search state saved with the bank, or
+    None if no valid cache exists. A directory that is missing, partial, or replaced by another search
+    while loading is treated as no cache.
+    '''
+
+    try:
+        return read_bank(Path(path), examples, operators)
+    except (OSError, ValueError, KeyError, IndexError, StopIteration):
+        return None
+
+
+def read_bank(path, examples, operators):
+    '''
+    Read a program bank from a directory, as in load_bank(), raising an exception if the directory is
+    not a valid cache.
+    '''
+
+    with open(path / "meta.json") as f:
+        meta = json.load(f)
+    if meta["operators"] != [type(op).__name__ for op in operators]:
+        return None
+
+    opcodes = np.load(path / "opcodes.npy", mmap_mode="r")
+    children = np.load(path / "children.npy", mmap_mode="r")
+    if len(opcodes) != meta["size"] or len(children) != meta["size"]:
+        raise ValueError(f"Cached program bank in {path} is incomplete.")
+
+    # rebuild programs in bank order, so that children are always rebuilt before their parents
+    bank = ProgramBank(examples)
+    leaves = iter(meta["leaves"])
+    for opcode, child_indices in zip(opcodes.tolist(), children.tolist()):
+        if opcode == -1:
+            name, value = next(leaves)
+            bank.add(leaf_classes[name](value))
+        else:
+            op = operators[opcode]
+            bank.add(OperatorNode(op, [bank.programs[i] for i in child_indices[:op.arity]]))
+
+    return bank, meta["weight"], meta.get("state")
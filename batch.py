@@ -0,0 +1,155 @@
+'''
+BATCH SYNTHESIS
+This file contains the entry point for synthesizing programs for many sets of input-output examples at
+once. Tasks are grouped by domain and input vectors, and the program bank of each group is enumerated a
+single time. Every new program is then checked against the target outputs of all tasks in the group with
+a single hash lookup of its output signature. Results are written as JSON lines, one line per task.
+
+Example of usage:
+python batch.py --tasks tasks.jsonl --output results.jsonl --max-weight 6
+
+where each line of tasks.jsonl is of the form:
+{"name": "addition", "domain": "arithmetic", "examples": [[[7, 2], 9], [[8, 1], 9]]}
+
+The "domain" key is optional, and is inferred from the types of the examples if omitted. If no tasks
+file is provided, all examples in the "example_set" dictionary in examples.py are synthesized.
+'''
+
+# load libraries
+import argparse
+import json
+import sys
+import time
+
+# import examples and synthesizer
+from examples import example_set, check_examples
+from synthesis import synthesize, get_operators
+from search_options import options_from_args, search_parser
+
+
+# PARSE ARGUMENTS
+def parse_args():
+    '''
+    Parse command line arguments.
+    '''
+
+    parser = argparse.ArgumentParser(description="Batch bottom-up enumerative synthesis in Python.", parents=[search_parser()])
+
+    parser.add_argument('--tasks', type=str, required=False, default=None,
+                        help='JSON lines file of tasks to synthesize. Defaults to all examples in the "example_set" dictionary.')
+
+    parser.add_argument('--output', type=str, required=False, default=None,
+                        help='JSON lines file to write results to. Defaults to standard output.')
+
+    parser.add_argument('--max-weight', type=int, required=False, default=3,
+                        help='Maximum weight of programs to consider before terminating search.')
+
+    args = parser.parse_args()
+
+    # check that the options of the search can be combined
+    options_from_args(args, parser)
+
+    return args
+
+
+# LOAD TASKS
+def infer_domain(examples):
+    '''
+    Infer the domain of a set of input-output examples, i.e., "strings" if any input or output is a
+    string, and "arithmetic" otherwise.
+    '''
+
+    values = [value for input, output in examples for value in list(input) + [output]]
+    return "strings" if any([type(value) == str for value in values]) else "arithmetic"
+
+
+def load_tasks(path = None):
+    '''
+    Load tasks from a JSON lines file, or from the "example_set" dictionary if no path is provided.
+    Returns a list of dictionaries with keys "name", "domain", and "examples".
+    '''
+
+    if path is None:
+        tasks = [{"name": key, "examples": examples} for key, examples in example_set.items()]
+    else:
+        with open(path) as f:
+            tasks = [json.loads(line) for line in f if line.strip()]
+
+    for task in tasks:
+        task["examples"] = [(list(input), output) for input, output in task["examples"]]
+        check_examples(task["examples"])
+        task.setdefault("domain", infer_domain(task["examples"]))
+
+    return tasks
+
+
+def group_tasks(tasks):
+    '''
+    Group tasks by domain and input vectors. Returns a dictionary mapping (domain, inputs) to the
+    list of tasks in the group, where inputs is a JSON string of the input vectors.
+    '''
+
+    groups = {}
+    for task in tasks:
+        inputs = json.dumps([input for input, output in task["examples"]])
+        groups.setdefault((task["domain"], inputs), []).append(task)
+
+    return groups
+
+
+# RUN BATCH SYNTHESIS
+def run_batch(tasks, max_weight, options = None):
+    '''
+    Synthesize programs for a list of tasks with the given search options (see search_options.py),
+    enumerating the program bank once for each group of tasks with the same domain and inputs. Yields a result dictionary for each task, with the synthesized
+    program (or None), its weight, the time from the start of the group to the solution, and the total
+    time of the group, whose enumeration is shared by all tasks in the group.
+    '''
+
+    for group_index, ((domain, _), group) in enumerate(group_tasks(tasks).items()):
+
+        # map target outputs to the tasks in the group
+        tasks_by_target = {}
+        for task in group:
+            target = tuple([output for input, output in task["examples"]])
+            tasks_by_target.setdefault(target, []).append(task)
+
+        # enumerate shared program bank, searching for all targets at once
+        start_time = time.time()
+        solutions = {}
+        for event in synthesize(group[0]["examples"], get_operators(domain), max_weight, options,
+                                targets = tasks_by_target.keys()):
+            if event["event"] == "solution":
+                solutions[event["target"]] = (event["program"], time.time() - start_time)
+        group_time = time.time() - start_time
+
+        # yield results in the order of tasks in the group
+        for task in group:
+            target = tuple([output for input, output in task["examples"]])
+            program, elapsed_time = solutions.get(target, (None, group_time))
+            yield {
+                "name": task["name"],
+                "domain": domain,
+                "group": group_index,
+                "group_size": len(group),
+                "program": None if program is None else program.str(),
+                "weight": None if program is None else program.weight,
+                "time": round(elapsed_time, 4),
+                "group_time": round(group_time, 4),
+            }
+
+
+if __name__ == '__main__':
+
+    # parse command line arguments
+    args = parse_args()
+    tasks = load_tasks(args.tasks)
+
+    # run batch synthesis, writing results as JSON lines
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    for result in run_batch(tasks, args.max_weight, options_from_args(args)):
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if args.output is not None:
+        output.close()
@@ -0,0 +1,281 @@
+'''
+BENCHMARK SUITE
+This file contains a reproducible benchmark suite for the synthesizer. The suite consists of every key in
+the "example_set" dictionary, together with harder tasks generated from a fixed random seed. Each task is
+run in a fresh process, and the following metrics are recorded:
+
+    time: wall time of the search in seconds (the minimum over --repeat runs)
+    programs_per_second: number of candidate programs checked per second
+    bank_sizes: size of the program bank after each level
+    peak_rss: peak resident set size of the process in MB
+    candidates: number of candidate programs checked
+    pruned: number of candidates pruned by each rule (see synthesize() in synthesis.py)
+
+Results are written as JSON. If a baseline is provided, results are compared against the baseline, and the
+run fails (with exit code 1) if any task is slower or uses more memory than the baseline by more than the
+given tolerance, or no longer finds a program of the same weight.
+
+Example of usage:
+python benchmark.py --output baseline.json
+python benchmark.py --baseline baseline.json --tolerance 0.25
+'''
+
+# load libraries
+import argparse
+import json
+import multiprocessing
+import random
+import string
+import sys
+import time
+
+# import DSLs and synthesizer
+from arithmetic import IntegerVariable, Add, Subtract, Multiply
+from strings import StringVariable, Concatenate, Left, Right
+from program_bank import ProgramBank
+from enumeration import level_candidates
+from examples import example_set
+from batch import infer_domain
+from synthesis import synthesize, get_operators, memory_usage
+from search_options import SearchOptions, search_parser
+
+# times below this many seconds are too short to compare reliably
+MIN_COMPARED_TIME = 0.05
+
+
+# PARSE ARGUMENTS
+def parse_args():
+    '''
+    Parse command line arguments.
+    '''
+
+    parser = argparse.ArgumentParser(description="Benchmark suite for bottom-up enumerative synthesis.", parents=[search_parser(bank=False)])
+
+    parser.add_argument('--output', type=str, required=False, default=None,
+                        help='JSON file to write results to. Defaults to standard output.')
+
+    parser.add_argument('--baseline', type=str, required=False, default=None,
+                        help='JSON file of baseline results to compare against.')
+
+    parser.add_argument('--tolerance', type=float, required=False, default=0.25,
+                        help='Relative increase in time or peak memory over the baseline that is reported as a regression.')
+
+    parser.add_argument('--max-weight', type=int, required=False, default=7,
+                        help='Maximum weight of programs to consider for the tasks in the "example_set" dictionary.')
+
+    parser.add_argument('--weights', type=int, nargs='+', required=False, default=[5, 7],
+                        help='Weights of generated tasks. Since all operators are binary, only odd weights have programs, so weights must be odd.')
+
+    parser.add_argument('--tasks-per-weight', type=int, required=False, default=2,
+                        help='Number of generated tasks per domain and weight.')
+
+    parser.add_argument('--seed', type=int, required=False, default=0,
+                        help='Random seed for generated tasks.')
+
+    parser.add_argument('--repeat', type=int, required=False, default=1,
+                        help='Number of runs of each task, of which the fastest is reported.')
+
+    parser.add_argument('--timeout', type=float, required=False, default=120,
+                        help='Maximum time in seconds for each run of a task.')
+
+    args = parser.parse_args()
+
+    # check that generated tasks have programs, since only odd weights do
+    if any([weight % 2 == 0 for weight in args.weights]):
+        parser.error("--weights must be odd, since all operators are binary.")
+
+    return args
+
+
+# GENERATE TASKS
+def generate_inputs(domain, rng):
+    '''
+    Generate the example inputs of a generated task, i.e., five pairs of integers for the arithmetic
+    domain, and three tuples of two words and an integer for the string domain.
+    '''
+
+    if domain == "arithmetic":
+        return [[rng.randint(1, 9), rng.randint(1, 9)] for _ in range(5)]
+
+    words = lambda: "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 6)))
+    return [[words(), words(), rng.randint(1, 4)] for _ in range(3)]
+
+
+def generate_tasks(weights, tasks_per_weight = 2, seed = 0):
+    '''
+    Generate tasks of the given weights for both domains. For each domain, a program bank is enumerated
+    on random example inputs, and programs are sampled from the buckets of the return type and each
+    weight. Since the program bank holds a single program per output signature, no lighter program in
+    the enumerated DSL satisfies the generated examples. Division is left out of the enumerated DSL, so
+    that all generated outputs are integers.
+    '''
+
+    rng = random.Random(seed)
+    tasks = []
+    for domain in ["arithmetic", "strings"]:
+
+        # define enumerated DSL and example inputs
+        if domain == "arithmetic":
+            operators, leaves = [Add(), Subtract(), Multiply()], [IntegerVariable(0), IntegerVariable(1)]
+        else:
+            operators, leaves = [Concatenate(), Left(), Right()], [StringVariable(0), StringVariable(1), IntegerVariable(2)]
+        return_type = operators[0].return_type
+        inputs = generate_inputs(domain, rng)
+
+        # enumerate program bank up to the largest weight
+        bank = ProgramBank([(input, None) for input in inputs])
+        for leaf in leaves:
+            bank.add(leaf)
+        for weight in range(2, max(weights) + 1):
+            for program in level_candidates(bank, operators, weight):
+                if bank.signature(program) not in bank.signatures:
+                    bank.add(program)
+
+        # sample programs of each weight as tasks
+        for weight in weights:
+            bucket = bank.buckets.get((return_type, weight), [])
+            for i, program in enumerate(rng.sample(bucket, min(tasks_per_weight, len(bucket)))):
+                tasks.append({
+                    "name": f"{domain}_w{weight}_{i}",
+                    "domain": domain,
+                    "max_weight": weight,
+                    "examples": [(input, output) for input, output in zip(inputs, bank.signature(program))],
+                })
+
+    return tasks
+
+
+def benchmark_tasks(max_weight, weights, tasks_per_weight = 2, seed = 0):
+    '''
+    Returns the tasks of the benchmark suite, i.e., every key in the "example_set" dictionary followed
+    by the generated tasks.
+    '''
+
+    tasks = [{"name": key, "domain": infer_domain(examples), "max_weight": max_weight, "examples": examples}
+             for key, examples in example_set.items()]
+    return tasks + generate_tasks(weights, tasks_per_weight, seed)
+
+
+# RUN TASK
+def run_task(task, options, queue):
+    '''
+    Run the search for a single task, and put its metrics on the queue. This function is run in a fresh
+    process, so that the peak resident set size is that of the task alone.
+    '''
+
+    try:
+        start_time = time.time()
+        bank_sizes, program = {}, None
+        for event in synthesize(task["examples"], get_operators(task["domain"]), task["max_weight"], SearchOptions(**options)):
+            if event["event"] == "level" and event["weight"] > 2:
+                bank_sizes[event["weight"] - 1] = event["bank_size"]
+            elif event["event"] == "solution":
+                program = event["program"]
+            elif event["event"] == "done":
+                done = event
+        elapsed_time = time.time() - start_time
+
+    except Exception as error:
+        queue.put({"status": "error", "error": repr(error)})
+        return
+
+    bank_sizes[max(bank_sizes, default=1) + 1] = done["bank_size"]
+    queue.put({
+        "status": "ok",
+        "program": None if program is None else program.str(),
+        "weight": None if program is None else program.weight,
+        "time": round(elapsed_time, 4),
+        "programs_per_second": round(done["candidates"] / max(elapsed_time, 1e-9)),
+        "bank_sizes": bank_sizes,
+        "peak_rss": round(memory_usage(), 1),
+        "candidates": done["candidates"],
+        "pruned": done["pruned"],
+    })
+
+
+def benchmark_task(task, options, repeat = 1, timeout = None):
+    '''
+    Run a task repeat times, each in a fresh process, and return the metrics of the fastest run.
+    '''
+
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        queue = context.Queue()
+        process = context.Process(target=run_task, args=(task, options, queue))
+        process.start()
+        try:
+            runs.append(queue.get(timeout=timeout))
+        except Exception:
+            process.terminate()
+            runs.append({"status": "timeout"})
+        process.join()
+
+        # stop repeating tasks that do not finish
+        if runs[-1]["status"] != "ok":
+            break
+
+    result = min(runs, key=lambda run: run.get("time", float("inf")))
+    return {"name": task["name"], "domain": task["domain"], "max_weight": task["max_weight"], **result}
+
+
+# COMPARE AGAINST BASELINE
+def compare_results(results, baseline, tolerance = 0.25):
+    '''
+    Compare benchmark results against baseline results. Returns a list of regressions, each a string
+    describing a task that no longer runs, no longer finds a program of the same weight, or whose time
+    or peak memory has grown by more than the tolerance. Times below MIN_COMPARED_TIME are not compared.
+    '''
+
+    baseline = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        name, base = result["name"], baseline.get(result["name"])
+        if base is None or base["status"] != "ok":
+            continue
+
+        if result["status"] != "ok":
+            regressions.append(f"{name}: {result['status']} (baseline ok)")
+            continue
+
+        if result["weight"] != base["weight"]:
+            regressions.append(f"{name}: program weight {result['weight']} (baseline {base['weight']})")
+
+        if result["time"] > base["time"] * (1 + tolerance) and result["time"] > MIN_COMPARED_TIME:
+            regressions.append(f"{name}: time {result['time']}s (baseline {base['time']}s)")
+
+        if result["peak_rss"] > base["peak_rss"] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {result['peak_rss']} MB (baseline {base['peak_rss']} MB)")
+
+    return regressions
+
+
+if __name__ == '__main__':
+
+    # parse command line arguments
+    args = parse_args()
+    options = {"complete": args.complete, "backend": args.backend, "workers": args.workers}
+
+    # run benchmark suite
+    results = {"options": {**options, "max_weight": args.max_weight, "weights": args.weights,
+                           "tasks_per_weight": args.tasks_per_weight, "seed": args.seed}, "results": []}
+    for task in benchmark_tasks(args.max_weight, args.weights, args.tasks_per_weight, args.seed):
+        result = benchmark_task(task, options, args.repeat, args.timeout)
+        results["results"].append(result)
+        print(f"- {result['name']}: {result['status']}, {result.get('time', '-')}s, {result.get('program')}", file=sys.stderr)
+
+    # write results as JSON
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # compare against baseline, failing the run if any regression is found
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = compare_results(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"- Regression: {regression}", file=sys.stderr)
+        if len(regressions) > 0:
+            sys.exit(1)
@@ -0,0 +1,303 @@
+'''
+BEST-FIRST SYNTHESIS
+This file contains a cost-guided variant of bottom-up enumerative synthesis. Rather than enumerating
+programs level by level in order of integer weight, every operator, constant, and variable carries a
+real-valued cost, and programs are enumerated in order of increasing total cost from a priority queue.
+Likely programs (i.e., those built from cheap operators) are then found before unlikely programs of the
+same or lower weight.
+
+Costs are given as a dictionary mapping the class name of an operator or leaf (e.g., "Add" or
+"IntegerVariable") to a positive cost, where names without a cost default to 1.0, so that by default the
+cost of a program is its weight. Costs can be loaded from a JSON file, or learned from the frequency of
+each operator and leaf in the solutions of previously solved tasks, in the spirit of the learned weights
+of BUSTLE: a node with probability p under the observed frequencies costs -log2(p).
+
+Example of usage:
+python best_first.py --domain arithmetic --examples add_5_multiply_2 --max-cost 5 --costs costs.json
+
+To learn costs from the tasks in a JSON lines file (see batch.py), or from all examples in examples.py:
+python best_first.py --learn-costs --tasks tasks.jsonl --max-weight 5 --costs costs.json
+'''
+
+# load libraries
+import argparse
+import heapq
+import itertools
+import json
+import math
+import time
+
+# import synthesizer
+from abstract_syntax_tree import OperatorNode, ERROR
+from program_bank import ProgramBank
+from batch import load_tasks, group_tasks
+from examples import example_set
+from synthesis import synthesize, get_operators, extract_constants
+from search_options import search_parser
+
+# class names of the leaves of both domains, which are costed alongside the operators
+LEAF_NAMES = ["IntegerConstant", "IntegerVariable", "StringConstant", "StringVariable"]
+
+
+# PARSE ARGUMENTS
+def parse_args():
+    '''
+    Parse command line arguments.
+    '''
+
+    parser = argparse.ArgumentParser(description="Cost-guided best-first bottom-up enumerative synthesis in Python.",
+                                     parents=[search_parser(bank=False, backend=False)])
+
+    parser.add_argument('--domain', type=str, required=False, default=None,
+                        choices=["arithmetic", "strings"],
+                        help='Domain of synthesis (either "arithmetic" or "string").')
+
+    parser.add_argument('--examples', dest='examples_key', type=str, required=False, default=None,
+                        choices=example_set.keys(),
+                        help='Examples to synthesize program from. Must be a valid key in the "example_set" dictionary.')
+
+    parser.add_argument('--max-cost', type=float, required=False, default=3.0,
+                        help='Maximum cost of programs to consider before terminating search.')
+
+    parser.add_argument('--costs', type=str, required=False, default=None,
+                        help='JSON file mapping operator and leaf class names to costs. Written to instead if --learn-costs is set.')
+
+    parser.add_argument('--top-k', type=int, required=False, default=1,
+                        help='Number of satisfying programs to find before terminating search, in order of increasing cost.')
+
+    parser.add_argument('--learn-costs', action='store_true',
+                        help='Learn costs from the solutions of the tasks in --tasks, found by the level-by-level search up to --max-weight, and write them to --costs.')
+
+    parser.add_argument('--tasks', type=str, required=False, default=None,
+                        help='JSON lines file of tasks to learn costs from. Defaults to all examples in the "example_set" dictionary.')
+
+    parser.add_argument('--max-weight', type=int, required=False, default=5,
+                        help='Maximum weight of the solutions of the tasks to learn costs from.')
+
+    args = parser.parse_args()
+
+    # check that costs are written somewhere when learned, and that a task is given otherwise
+    if args.learn_costs and args.costs is None:
+        parser.error("--learn-costs requires --costs.")
+    if not args.learn_costs and (args.domain is None or args.examples_key is None):
+        parser.error("--domain and --examples are required unless --learn-costs is set.")
+
+    return args
+
+
+# LOAD COSTS
+def load_costs(path):
+    '''
+    Load costs from a JSON file mapping operator and leaf class names to costs. Since a program is only
+    enumerated after its children, costs must be positive.
+    '''
+
+    with open(path) as f:
+        costs = {name: float(cost) for name, cost in json.load(f).items()}
+
+    if any([cost <= 0 for cost in costs.values()]):
+        raise ValueError(f"Costs in {path} must be positive.")
+
+    return costs
+
+
+# LEARN COSTS
+def count_nodes(program, counts):
+    '''
+    Count the operators and leaves of a program by class name.
+    '''
+
+    if isinstance(program, OperatorNode):
+        name = type(program.operator).__name__
+        for child in program.children:
+            count_nodes(child, counts)
+    else:
+        name = type(program).__name__
+    counts[name] = counts.get(name, 0) + 1
+
+
+def learn_costs(programs, names = (), smoothing = 1.0):
+    '''
+    Returns costs learned from the frequency of each operator and leaf in a list of programs, such that
+    a node with (additively smoothed) relative frequency p costs -log2(p). Names that never occur in the
+    programs (e.g., the operators of a domain) can be given, so that they are costed as well.
+    '''
+
+    counts = dict.fromkeys(names, 0)
+    for program in programs:
+        count_nodes(program, counts)
+
+    total = sum(counts.values()) + smoothing * len(counts)
+    return {name: -math.log2((count + smoothing) / total) for name, count in counts.items()}
+
+
+def solve_tasks(tasks, max_weight):
+    '''
+    Returns the solutions of a list of tasks found by the level-by-level search up to max_weight,
+    enumerating the program bank once for each group of tasks with the same domain and inputs.
+    '''
+
+    programs = []
+    for (domain, _), group in group_tasks(tasks).items():
+        targets = set([tuple([output for input, output in task["examples"]]) for task in group])
+        for event in synthesize(group[0]["examples"], get_operators(domain), max_weight, targets = targets):
+            if event["event"] == "solution":
+                programs.append(event["program"])
+
+    return programs
+
+
+# BEST-FIRST SYNTHESIS ENGINE
+def best_first_synthesize(examples, operators, max_cost, costs = None, complete = False, top_k = 1):
+    '''
+    Run cost-guided bottom-up enumerative synthesis as a generator, which yields events as dictionaries
+    with an "event" key, in the following order:
+
+        {"event": "start", "constants": ...}: constants and variables have been extracted
+        {"event": "solution", "program": ..., "cost": ..., "rank": ...}: a satisfying program was found
+        {"event": "done", "solutions": ..., "bank_size": ..., "candidates": ..., "pruned": ...}: the search has ended
+
+    Candidates are popped from a priority queue in order of increasing cost, and are checked against the
+    examples and for observational equivalence as in synthesize(). When a program is added to the program
+    bank, it is paired with every program added before it as the children of each (binary) operator. The
+    programs of each type are added in order of cost, so the candidates of an operator, a new program, and
+    a position of the new program form a stream in order of cost, which is pushed onto the queue as a single
+    entry and only advanced when its candidate is popped. Since costs are positive, every program is popped
+    after its children, and programs are enumerated in order of increasing cost.
+
+    As with ProgramBank.children(), arguments of the same type are drawn in the order added (i.e., the new
+    program last, without repetition), unless complete is True. Since programs are added in order of cost
+    here rather than level by level, the order of two programs of the same type (and hence which of
+    op(a, b) and op(b, a) is enumerated for a non-commutative operator) can differ from synthesize(). With
+    default costs, the program bank therefore matches that of synthesize() if complete is True, but may
+    differ otherwise (e.g., 81218 against 80373 programs for multiply_add_9 up to weight 7). Solutions are yielded in order of cost, and the search ends after top_k solutions have been
+    found (or at max_cost if top_k is None).
+
+    Example:
+        costs = {"Add": 0.5, "Multiply": 2.0}
+        for event in best_first_synthesize(example_set["addition"], arithmetic_operators, 3, costs):
+            if event["event"] == "solution":
+                print(event["program"].str()) # prints "(x0 + x1)"
+    '''
+
+    costs = {} if costs is None else costs
+    program_bank = ProgramBank(examples)
+    programs = {}   # dictionary mapping type to list of tuples (program, cost) in the order added
+    state = {"solutions": 0, "candidates": 0, "pruned": {"error": 0, "equivalence": 0}}
+
+    # queue entries are tuples (cost, order, op, program, position, index, end), where the candidate is op
+    # applied to program at position and the program at index of the bank of the other argument type, and
+    # the stream continues up to end; leaves are pushed with op None, and ties are broken in the order pushed
+    queue = []
+    order = itertools.count()
+    def push(cost, op, program, position = None, index = None, end = None):
+        if cost <= max_cost:
+            heapq.heappush(queue, (cost, next(order), op, program, position, index, end))
+
+    # push the candidate streams of a program added to the program bank
+    def push_streams(program, cost):
+        for op in operators:
+            op_cost = costs.get(type(op).__name__, 1.0)
+            for position in range(2):
+                if op.arg_types[position] != program.type:
+                    continue
+
+                # arguments of the same type are drawn in order, so the new program comes last
+                other_type = op.arg_types[1 - position]
+                same_type = other_type == program.type
+                if same_type and position == 0 and not (complete and not op.commutative):
+                    continue
+
+                # pair with every program of the other type added before, and with itself if complete
+                # (from the second position only, so that the self-pair is not generated twice)
+                others = programs.get(other_type, [])
+                end = len(others) + (1 if same_type and complete and position == 1 else 0)
+                if end > 0:
+                    other_cost = others[0][1] if len(others) > 0 else cost
+                    push(op_cost + cost + other_cost, op, program, position, 0, end)
+
+    # extract constants and variables from examples
+    constants = extract_constants(examples)
+    for p in constants:
+        push(costs.get(type(p).__name__, 1.0), None, p)
+    yield {"event": "start", "constants": len(constants)}
+
+    # enumerate programs in order of increasing cost
+    while len(queue) > 0:
+        cost, _, op, program, position, index, end = heapq.heappop(queue)
+
+        # construct candidate from its stream, and advance the stream
+        if op is not None:
+            others = programs[op.arg_types[1 - position]]
+            other = others[index][0]
+            if index + 1 < end:
+                push(cost - others[index][1] + others[index + 1][1], op, program, position, index + 1, end)
+            program = OperatorNode(op, (program, other) if position == 0 else (other, program))
+        state["candidates"] += 1
+
+        # prune program if its output is undefined on any input
+        signature = program_bank.signature(program)
+        if signature is ERROR:
+            state["pruned"]["error"] += 1
+            continue
+
+        # check if program passes all examples
+        if signature == program_bank.target:
+            state["solutions"] += 1
+            yield {"event": "solution", "program": program, "cost": cost, "rank": state["solutions"]}
+            if state["solutions"] == top_k:
+                break
+
+        # check if program is observationally equivalent to a cheaper program in program bank
+        if signature in program_bank.signatures:
+            state["pruned"]["equivalence"] += 1
+            continue
+
+        # add program to program bank, and push the candidates built from it
+        program_bank.add(program)
+        push_streams(program, cost)
+        programs.setdefault(program.type, []).append((program, cost))
+
+    yield {"event": "done", "solutions": state["solutions"], "bank_size": len(program_bank),
+           "candidates": state["candidates"], "pruned": state["pruned"]}
+
+
+if __name__ == '__main__':
+
+    # parse command line arguments
+    args = parse_args()
+
+    # learn costs from the solutions of previously solved tasks
+    if args.learn_costs:
+        tasks = load_tasks(args.tasks)
+        programs = solve_tasks(tasks, args.max_weight)
+        names = LEAF_NAMES + [type(op).__name__ for domain in ["arithmetic", "strings"] for op in get_operators(domain)]
+        costs = learn_costs(programs, names)
+        with open(args.costs, "w") as f:
+            json.dump(costs, f, indent=2)
+        print(f"- Learned costs from {len(programs)} solutions of {len(tasks)} tasks, written to {args.costs}.")
+
+    # otherwise, run best-first synthesis
+    else:
+        examples = example_set[args.examples_key]
+        costs = None if args.costs is None else load_costs(args.costs)
+
+        start_time = time.time()
+        solutions = []
+        for event in best_first_synthesize(examples, get_operators(args.domain), args.max_cost, costs,
+                                           args.complete, args.top_k):
+            if event["event"] == "solution":
+                solutions.append((event["program"], event["cost"]))
+            elif event["event"] == "done":
+                print(f"- Checked {event['candidates']} candidates, storing {event['bank_size']} programs.")
+        elapsed_time = round(time.time() - start_time, 4)
+
+        # check if program was found
+        print("\nSynthesis Results:")
+        if len(solutions) == 0:
+            print(f"- Max cost of {args.max_cost} reached, no program found in {elapsed_time}s.")
+        for program, cost in solutions:
+            print(f"- Program found in {elapsed_time}s.")
+            print(f"- Program: {program.str()}")
+            print(f"- Program cost: {round(cost, 4)}")
+            print(f"- Program weight: {program.weight}")
@@ -0,0 +1,79 @@
+'''
+PROGRAM COMPILATION
+This file contains functions to compile a program into a Python function. Evaluating a program with
+evaluate() recurses through a method call for each node of its AST and validates the input at each
+variable, which is slow when a synthesized program is evaluated many times after synthesis. Instead, a
+program is lowered into the source of a single Python expression, which is compiled once into a function.
+
+Operators define a compile() method that returns the source of the operator applied to the source of its
+operands, in the same way as the str() method. Operators whose output can be undefined (i.e., the division
+operators) also define a compile_guard() method that returns the source of the condition under which the
+output is defined. Their operands are then bound to names, so that each operand is evaluated once, and the
+expression raises Undefined if the condition fails. As with evaluate(), the compiled function returns None
+if the output is undefined, while any other error (e.g., an operand of the wrong type) is raised.
+
+Example:
+    program = OperatorNode(Add(), [IntegerVariable(0), IntegerConstant(5)])
+    function = compile_program(program) # returns (input[0] + 5)
+    function([7]) # returns 12
+'''
+
+# load libraries
+import itertools
+
+# import AST
+from abstract_syntax_tree import OperatorNode
+
+
+class Undefined(Exception):
+    '''
+    Exception raised by a compiled program when the output of an operator is undefined.
+    '''
+
+
+def undefined():
+    raise Undefined()
+
+
+# LOWER PROGRAM TO SOURCE
+def program_source(program, names):
+    '''
+    Returns the source of a Python expression that evaluates the program on a list named input, where
+    names is an iterator of unique names to which the operands of guarded operators are bound.
+    '''
+
+    # variables index into the input, and constants are literals
+    if not isinstance(program, OperatorNode):
+        if hasattr(program, "position"):
+            return f"input[{program.position}]"
+        return repr(program.value)
+
+    # recursively lower the operands of the operator
+    operands = [program_source(child, names) for child in program.children]
+    if not hasattr(program.operator, "compile_guard"):
+        return program.operator.compile(*operands)
+
+    # otherwise, bind the operands to names (the tuple of assignments is always true), check the guard,
+    # and apply the operator to the names
+    # e.g., ((v0 / v1) if ((v0 := input[0]), (v1 := input[1])) and v1 != 0 else undefined())
+    bound = [next(names) for _ in operands]
+    assignments = ", ".join([f"({name} := {operand})" for name, operand in zip(bound, operands)])
+    return (f"({program.operator.compile(*bound)} if ({assignments},) and {program.operator.compile_guard(*bound)} "
+            f"else undefined())")
+
+
+# COMPILE PROGRAM
+def compile_program(program):
+    '''
+    Compile a program into a Python function of a single input (i.e., a list of arguments), which returns
+    the same output as program.evaluate(input). The input is not validated.
+    '''
+
+    names = (f"v{i}" for i in itertools.count())
+    expression = program_source(program, names)
+
+    # compile expression into a function, whose output is None if the output of any operator is undefined
+    source = f"def function(input):\n    try:\n        return {expression}\n    except Undefined:\n        return None\n"
+    namespace = {"Undefined": Undefined, "undefined": undefined}
+    exec(compile(source, f"<{program.str()}>", "exec"), namespace)
+    return namespace["function"]
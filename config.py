@@ -22,4 +22,17 @@ else:
 # define project configuration variables
 # DATA_DIR = PROJECT_DIR / 'Data'
 # RESULTS_DIR = PROJECT_DIR / 'Results'
-SEED = 42
\ No newline at end of file
+SEED = 42
+
+# define directory in which enumerated program banks are cached (see bank_cache.py)
+CACHE_DIR = Path(__file__).resolve().parent / '.bank_cache'
+
+# define maximum number of searches kept in memory by the Streamlit app, and the interval in seconds
+# at which the app refreshes the progress of a running search
+APP_CACHE_ENTRIES = 32
+APP_REFRESH_INTERVAL = 0.5
+
+# define maximum number of programs stored in the program bank of a search run by the app, and the number
+# of seconds after the last request for an unknown result at which a search is stopped
+APP_MAX_BANK_SIZE = 1000000
+APP_SEARCH_LEASE = 5.0
\ No newline at end of file
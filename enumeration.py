@@ -0,0 +1,74 @@
+'''
+CANDIDATE ENUMERATION
+This file contains the functions that generate the candidate programs at each level of bottom-up
+synthesis, using either the Python or the vectorized NumPy evaluation backend.
+'''
+
+# import AST and vectorized backend
+from abstract_syntax_tree import OperatorNode
+from vectorized import vectorized_candidates
+
+
+# RESUME ENUMERATION OF A LEVEL
+def resume_rows(op_index, partition, n_rows, start = None):
+    '''
+    Returns the rows of the bucket of the first child to enumerate for an operator and weight partition
+    when resuming a level at position start, or None if the partition was already enumerated. The
+    position start is a tuple (op_index, partition, row), and since operators are enumerated in order
+    and partitions in lexicographic order, all candidates before this position were already enumerated.
+    '''
+
+    if start is None:
+        return range(n_rows)
+
+    start_op_index, start_partition, start_row = start
+    if (op_index, partition) < (start_op_index, start_partition):
+        return None
+    if (op_index, partition) == (start_op_index, start_partition):
+        return range(start_row, n_rows)
+    return range(n_rows)
+
+
+def candidate_position(program, operators, bank):
+    '''
+    Returns the position (op_index, partition, row) of a candidate program in the enumeration of its level.
+    '''
+
+    op_index = [i for i, op in enumerate(operators) if op is program.operator][0]
+    partition = tuple([child.weight for child in program.children])
+    first_bucket = bank.buckets[(program.children[0].type, partition[0])]
+    row = [i for i, child in enumerate(first_bucket) if child is program.children[0]][0]
+
+    return (op_index, partition, row)
+
+
+# GENERATE CANDIDATES FOR A WEIGHT PARTITION
+def partition_candidates(bank, op, partition, complete = False, backend = "python", rows = None):
+    '''
+    Generate candidate programs of an operator whose children are drawn from the buckets of the
+    program bank given by a weight partition. If rows is provided, only children whose first
+    argument is at one of these indices in its bucket are used.
+    '''
+
+    # evaluate operator over whole buckets of the program bank if vectorized
+    if backend == "numpy" and op.arity == 2 and hasattr(op, "evaluate_vectorized"):
+        return vectorized_candidates(bank, op, partition, complete, rows)
+
+    # otherwise, construct programs from children drawn from the program bank
+    children = bank.partition_children(op.arg_types, partition, complete, op.commutative, rows)
+    return (OperatorNode(op, combination) for combination in children)
+
+
+# GENERATE CANDIDATES FOR A LEVEL
+def level_candidates(bank, operators, weight, complete = False, backend = "python", start = None):
+    '''
+    Generate candidate programs of exactly the given weight, iterating over each operator and each
+    partition of weight - op.weight into the weights of the children of the operator. If start is
+    provided, the enumeration resumes at this position (see resume_rows()).
+    '''
+
+    for op_index, op in enumerate(operators):
+        for partition in bank.child_partitions(op.arg_types, weight - op.weight, complete, op.commutative):
+            rows = resume_rows(op_index, partition, len(bank.buckets[(op.arg_types[0], partition[0])]), start)
+            if rows is not None:
+                yield from partition_candidates(bank, op, partition, complete, backend, rows)
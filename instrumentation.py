@@ -0,0 +1,127 @@
+'''
+SEARCH INSTRUMENTATION
+This file contains the Python class that records counters and timers of the search in each level and for
+each operator. Instrumentation is off by default, in which case the engine only checks that no statistics
+object exists, which it does four to five times per candidate (about 60 nanoseconds in all, against several
+microseconds to check a candidate), so that instrumentation can be left in production builds.
+
+For each level, the statistics report the time of the level, the size of the program bank at the end of
+the level, and the following counters for each operator:
+
+    candidates: number of candidate programs checked by the engine
+    rejected_type: number of weight partitions skipped because some argument has no bucket of its type
+        at its weight, so that no candidates are built from them
+    rejected_weight: number of weight partitions skipped because arguments of the same type would be
+        out of bank order (see ProgramBank.child_partitions())
+    rejected_error: number of candidates rejected because their output is undefined on some input
+    rejected_magnitude: number of candidates rejected because an output exceeds the magnitude cap
+    rejected_goal: number of string candidates rejected because an output is not a substring of the target
+    rejected_equivalence: number of candidates rejected as observationally equivalent to a program in the bank
+    stored: number of candidates added to the program bank
+    evaluation_time: time spent computing the output vectors of candidates, in seconds
+    equivalence_time: time spent checking candidates for observational equivalence, in seconds
+
+Since arguments are only ever drawn from the buckets of the program bank with the matching type and weight,
+individual candidates are never rejected by type or weight, and these rules are counted per partition. With
+the NumPy backend or multiple workers, output vectors are mostly computed (and duplicates skipped) while
+candidates are generated, which is included in the time of the level but not in the evaluation time.
+'''
+
+# load libraries
+import math
+import time
+
+
+class SearchStatistics:
+    '''
+    Class to represent the counters and timers of a search, recorded level by level.
+
+    Example:
+        statistics = SearchStatistics()
+        statistics.start_level(3, bank, operators)
+        counters = statistics.operator(program)
+        counters["candidates"] += 1
+        event = statistics.end_level(len(bank))
+    '''
+
+    def __init__(self):
+        self.levels = []        # list of statistics of each level, in order of weight
+        self.current = None     # dictionary mapping operator name to counters of the current level
+        self.start_time = None  # start time of the current level
+
+    def start_level(self, weight, bank, operators, complete = False):
+        '''
+        Start recording a level, counting the weight partitions of each operator that are skipped.
+        '''
+
+        self.current = {}
+        for op in operators:
+
+            # count all partitions of the weight of the children into positive weights
+            child_weight = weight - op.weight
+            partitions = math.comb(child_weight - 1, op.arity - 1) if child_weight >= op.arity else 0
+
+            # count partitions with a bucket for every argument, and those in bank order
+            matched = len(list(bank.weight_partitions(op.arg_types, child_weight)))
+            ordered = len(list(bank.child_partitions(op.arg_types, child_weight, complete, op.commutative)))
+
+            self.current[type(op).__name__] = {
+                "candidates": 0,
+                "rejected_type": partitions - matched,
+                "rejected_weight": matched - ordered,
+                "rejected_error": 0,
+                "rejected_magnitude": 0,
+                "rejected_goal": 0,
+                "rejected_equivalence": 0,
+                "stored": 0,
+                "evaluation_time": 0.0,
+                "equivalence_time": 0.0,
+            }
+
+        self.levels.append({"weight": weight, "time": None, "bank_size": None, "operators": self.current})
+        self.start_time = time.perf_counter()
+
+    def operator(self, program):
+        '''
+        Returns the counters of the operator of a candidate program in the current level.
+        '''
+        return self.current[type(program.operator).__name__]
+
+    def end_level(self, bank_size):
+        '''
+        Stop recording the current level. Returns a "statistics" event with the statistics of the level.
+        '''
+
+        level = self.levels[-1]
+        level["time"] = time.perf_counter() - self.start_time
+        level["bank_size"] = bank_size
+        return {"event": "statistics", **level}
+
+    def finish(self, bank_size):
+        '''
+        Stop recording the search, ending the current level if the search stopped within it. Returns
+        the statistics of all levels as a JSON-serializable dictionary.
+        '''
+
+        if len(self.levels) > 0 and self.levels[-1]["time"] is None:
+            self.end_level(bank_size)
+        return self.to_json()
+
+    def totals(self):
+        '''
+        Returns the counters of each operator summed over all levels.
+        '''
+
+        totals = {}
+        for level in self.levels:
+            for name, counters in level["operators"].items():
+                total = totals.setdefault(name, dict.fromkeys(counters, 0))
+                for counter, value in counters.items():
+                    total[counter] += value
+        return totals
+
+    def to_json(self):
+        '''
+        Returns the statistics of all levels and the totals of each operator as a JSON-serializable dictionary.
+        '''
+        return {"levels": self.levels, "totals": self.totals()}
@@ -0,0 +1,83 @@
+'''
+INVERSE LOOKUP
+This file contains the meet-in-the-middle search for solutions whose top-level operator is invertible.
+Rather than enumerating a program op(a, b) to check it against the target outputs, the output vector of
+b that would make op(a, b) a solution is computed from the outputs of a and the target outputs, and is
+looked up among the output signatures of the program bank. Since both a and b are drawn from the bank, a
+solution of weight up to 2w + 1 is found with a program bank complete up to weight w.
+
+Operators define an inverse() method, which returns the operand in the other position given the output
+and the operand in the given position, or None if there is no such operand. For example, Add.inverse(9, 7, 0)
+returns 2, and Concatenate.inverse("abc", "a", 0) returns "bc" (i.e., strips the prefix "a").
+
+Example:
+    program = inverse_solution(bank, arithmetic_operators, bank.programs, bank.target)
+    program.str() # returns "(x0 + x1)" for the addition examples
+'''
+
+# import AST
+from abstract_syntax_tree import OperatorNode
+
+
+# INVERT OUTPUT VECTOR
+def inverse_vector(operator, target, values, position):
+    '''
+    Returns the output vector of the operand in the other position, given the target output vector and
+    the output vector of the operand in the given position, or None if there is no such output vector.
+    '''
+
+    vector = []
+    for output, operand in zip(target, values):
+        value = operator.inverse(output, operand, position)
+        if value is None:
+            return None
+        vector.append(value)
+    return tuple(vector)
+
+
+# LOOK UP INVERSE SOLUTION
+def inverse_solution(bank, operators, programs, target, max_weight = None):
+    '''
+    Returns the smallest program op(a, b) whose output signature is target, where op is an invertible
+    operator, a is one of programs, and b is any program in the bank (in either position), or None if
+    there is no such program of weight at most max_weight.
+    '''
+
+    best = None
+    target_type = type(target[0])
+    for op in operators:
+
+        # only binary operators with an inverse that return the type of the target
+        if not hasattr(op, "inverse") or op.return_type != target_type:
+            continue
+
+        # for commutative operators, each pair of operands is found with the program in the first position
+        for position in range(1 if op.commutative else 2):
+            other = 1 - position
+            for program in programs:
+                if program.type != op.arg_types[position]:
+                    continue
+
+                # skip pairs that would exceed the maximum weight or cannot improve on the best solution found
+                if max_weight is not None and program.weight + op.weight + 1 > max_weight:
+                    continue
+                if best is not None and program.weight + op.weight + 1 >= best.weight:
+                    continue
+
+                # look up the output vector of the other operand in the program bank
+                vector = inverse_vector(op, target, bank.signature(program), position)
+                match = None if vector is None else bank.signatures.get(vector)
+                if match is None or match.type != op.arg_types[other]:
+                    continue
+
+                # check the solution, since inverses of inexact operations (e.g., of floats) may not round trip
+                children = (program, match) if position == 0 else (match, program)
+                candidate = OperatorNode(op, children)
+                if max_weight is not None and candidate.weight > max_weight:
+                    continue
+                if best is not None and candidate.weight >= best.weight:
+                    continue
+                if bank.signature(candidate) == target:
+                    best = candidate
+
+    return best
@@ -0,0 +1,110 @@
+'''
+PARALLEL ENUMERATION
+This file contains the multiprocess backend for bottom-up synthesis. Each level of the search is
+split into tasks by operator, weight partition, and slice of the bucket of the first child. Tasks
+are evaluated by a pool of worker processes, which return the output signatures of new programs.
+The parent process then deduplicates the results in task order, so that the programs enumerated
+are the same as in the serial search, regardless of the number of workers.
+
+Note that workers are forked from the parent process, so that they share the program bank without
+copying it. Parallel enumeration is therefore only supported on platforms that support forking.
+'''
+
+# load libraries
+import multiprocessing
+
+# import AST and candidate enumeration
+from abstract_syntax_tree import OperatorNode, ERROR
+from enumeration import partition_candidates, resume_rows
+
+# number of tasks per worker in each level, to balance load across workers
+TASKS_PER_WORKER = 4
+
+# state shared with forked worker processes
+worker_state = {}
+
+
+# SPLIT LEVEL INTO TASKS
+def level_tasks(bank, operators, weight, complete, workers, start = None):
+    '''
+    Split the enumeration of a level into tasks of the form (op_index, partition, rows), where rows is
+    a slice of the bucket of the first child. Tasks are returned in the order of the serial search. If
+    start is provided, the enumeration resumes at this position (see resume_rows()).
+    '''
+
+    tasks = []
+    for op_index, op in enumerate(operators):
+        for partition in bank.child_partitions(op.arg_types, weight - op.weight, complete, op.commutative):
+            rows = resume_rows(op_index, partition, len(bank.buckets[(op.arg_types[0], partition[0])]), start)
+            if rows is None:
+                continue
+            step = max(1, -(-len(rows) // (workers * TASKS_PER_WORKER)))
+            for first in range(rows.start, rows.stop, step):
+                tasks.append((op_index, partition, range(first, min(first + step, rows.stop))))
+
+    return tasks
+
+
+# RUN TASK IN WORKER
+def run_task(task):
+    '''
+    Enumerate the candidate programs of a task in a worker process. Returns a list of tuples of the form
+    (signature, rows), where rows are the indices of the children in their buckets, for candidates that
+    are not observationally equivalent to a program in the bank or to an earlier candidate of the task
+    (other than candidates that satisfy the input-output examples), and whose outputs are all defined.
+    '''
+
+    bank, operators = worker_state["bank"], worker_state["operators"]
+    complete, backend = worker_state["complete"], worker_state["backend"]
+    op_index, partition, rows = task
+    op = operators[op_index]
+
+    # map children to their indices in their buckets
+    keys = list(zip(op.arg_types, partition))
+    positions = [{id(program): row for row, program in enumerate(bank.buckets[key])} for key in keys]
+
+    results = []
+    seen = set()
+    for program in partition_candidates(bank, op, partition, complete, backend, rows):
+
+        # skip candidates observationally equivalent to a program in the bank or an earlier candidate
+        # note that candidates satisfying the examples are all kept, as each is a distinct solution
+        signature = bank.signature(program)
+        if signature is ERROR:
+            continue
+        if (signature in bank.signatures or signature in seen) and signature != bank.target:
+            continue
+        seen.add(signature)
+
+        child_rows = tuple([position[id(child)] for position, child in zip(positions, program.children)])
+        results.append((signature, child_rows))
+
+    return results
+
+
+# GENERATE CANDIDATES FOR A LEVEL IN PARALLEL
+def parallel_candidates(bank, operators, weight, complete = False, backend = "python", workers = 2, start = None):
+    '''
+    Generate candidate programs of exactly the given weight, as in level_candidates(), with the
+    candidates evaluated by a pool of worker processes. Candidates are yielded in the same order
+    as in the serial search, with their output vectors cached.
+    '''
+
+    tasks = level_tasks(bank, operators, weight, complete, workers, start)
+    if len(tasks) == 0:
+        return
+
+    # share the program bank with worker processes forked for this level
+    worker_state.update(bank = bank, operators = operators, complete = complete, backend = backend)
+    context = multiprocessing.get_context("fork")
+
+    with context.Pool(workers) as pool:
+        for (op_index, partition, rows), results in zip(tasks, pool.imap(run_task, tasks)):
+
+            # reconstruct programs from the indices of their children
+            op = operators[op_index]
+            buckets = [bank.buckets[key] for key in zip(op.arg_types, partition)]
+            for signature, child_rows in results:
+                program = OperatorNode(op, tuple([bucket[row] for bucket, row in zip(buckets, child_rows)]))
+                program.values = signature
+                yield program
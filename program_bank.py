@@ -0,0 +1,155 @@
+'''
+PROGRAM BANK
+This file contains the Python class that stores the programs enumerated during bottom-up synthesis.
+'''
+
+# load libraries
+import itertools
+
+
+class ProgramBank:
+    '''
+    Class to represent the bank of programs enumerated during bottom-up synthesis.
+
+    Programs are stored in the order in which they are added, and are indexed into buckets by type and
+    weight, so that each argument of an operator is only ever drawn from buckets of the matching type.
+    Since programs are enumerated level by level, every program in a bucket of lower weight was added
+    before every program in a bucket of higher weight. The output signature of each program is stored
+    in a hash table, so that checking observational equivalence is a single lookup.
+
+    Args:
+        examples (list): list of tuples, where each tuple is of the form (input, output)
+
+    Example:
+        bank = ProgramBank(examples)
+        bank.add(IntegerVariable(0))
+        bank.add(IntegerVariable(1))
+        for children in bank.children([int, int], 2):
+            program = OperatorNode(Add(), children) # (x0 + x1)
+    '''
+
+    def __init__(self, examples):
+        self.inputs = [example[0] for example in examples]  # inputs of input-output examples
+        self.target = tuple([example[1] for example in examples])  # target output signature
+        self.programs = []      # list of programs in the order added
+        self.buckets = {}       # dictionary mapping (type, weight) to list of programs
+        self.signatures = {}    # dictionary mapping output signature to program
+        self.arrays = {}        # cache of bucket arrays used by the vectorized backend
+
+    def __len__(self):
+        return len(self.programs)
+
+    def signature(self, program):
+        '''
+        Returns the output signature of a program on the inputs of the bank.
+        '''
+        return program.evaluate_vector(self.inputs)
+
+    def add(self, program):
+        '''
+        Add a program to the bank. Returns the output signature of the program.
+        '''
+
+        signature = self.signature(program)
+        self.programs.append(program)
+        self.buckets.setdefault((program.type, program.weight), []).append(program)
+        self.signatures.setdefault(signature, program)
+
+        return signature
+
+    def weight_partitions(self, arg_types, weight):
+        '''
+        Generate all tuples of child weights that sum to exactly weight, such that for each argument
+        there is a nonempty bucket with the argument type and the child weight.
+        '''
+
+        # base case: a single child must come from a nonempty bucket of the remaining weight
+        if len(arg_types) == 1:
+            if (arg_types[0], weight) in self.buckets:
+                yield (weight,)
+            return
+
+        # recursive case: choose the weight of the first child, then partition the remainder
+        first_weights = sorted([w for t, w in self.buckets.keys() if t == arg_types[0]])
+        for first in first_weights:
+            if first > weight - (len(arg_types) - 1):
+                break
+            for rest in self.weight_partitions(arg_types[1:], weight - first):
+                yield (first,) + rest
+
+    def child_partitions(self, arg_types, weight, complete = False, commutative = False):
+        '''
+        Generate the weight partitions from which children are drawn by children(). Unless every
+        ordered tuple is enumerated, arguments of the same type are drawn in bank order, so partitions
+        in which an argument is heavier than a later argument of the same type are skipped.
+        '''
+
+        arity = len(arg_types)
+        for partition in self.weight_partitions(arg_types, weight):
+
+            # skip partitions whose children of the same type would be out of bank order
+            if not (complete and not commutative):
+                if any([arg_types[i] == arg_types[j] and partition[i] > partition[j]
+                        for i, j in itertools.combinations(range(arity), 2)]):
+                    continue
+
+            yield partition
+
+    def children(self, arg_types, weight, complete = False, commutative = False):
+        '''
+        Generate all tuples of programs in the bank whose types match arg_types and whose weights
+        sum to exactly weight.
+
+        By default, as with itertools.combinations over the bank, each set of distinct programs of the
+        same type is generated once, with children in the order they were added to the bank. Because
+        programs are added in order of weight, this means that arguments of the same type have
+        non-decreasing weights, and arguments of the same type and weight are drawn as combinations
+        from one bucket. Arguments of different types are drawn independently from their own buckets.
+
+        If complete is True, all ordered tuples (including repeated children) are generated instead.
+        If the operator is also commutative, mirrored tuples are skipped by drawing arguments as
+        combinations with replacement rather than as a full product.
+        '''
+
+        for partition in self.child_partitions(arg_types, weight, complete, commutative):
+            yield from self.partition_children(arg_types, partition, complete, commutative)
+
+    def partition_children(self, arg_types, partition, complete = False, commutative = False, rows = None):
+        '''
+        Generate the tuples of children generated by children() for a single weight partition. If rows
+        is provided, only tuples whose first child is at one of these indices in its bucket are generated,
+        so that the enumeration of a partition can be split into slices.
+        '''
+
+        # get indices of the first child in its bucket
+        first_key = (arg_types[0], partition[0])
+        if rows is None:
+            rows = range(len(self.buckets[first_key]))
+
+        # draw every ordered tuple for complete enumeration of non-commutative operators
+        if complete and not commutative:
+            first_children = [self.buckets[first_key][row] for row in rows]
+            yield from itertools.product(first_children, *[self.buckets[key] for key in zip(arg_types[1:], partition[1:])])
+            return
+
+        # group argument positions by bucket, preserving the order of first appearance
+        groups = {}
+        for position, key in enumerate(zip(arg_types, partition)):
+            groups.setdefault(key, []).append(position)
+
+        # draw the arguments of each group as combinations from the same bucket
+        select = itertools.combinations_with_replacement if complete else itertools.combinations
+        choices = [select(self.buckets[key], len(positions)) for key, positions in groups.items()]
+
+        # restrict the group of the first child to combinations starting at the given rows
+        bucket = self.buckets[first_key]
+        count = len(groups[first_key])
+        offset = 0 if complete else 1
+        choices[0] = ((bucket[row],) + rest for row in rows for rest in select(bucket[row + offset:], count - 1))
+
+        for selection in itertools.product(*choices):
+            children = [None] * len(arg_types)
+            for positions, programs in zip(groups.values(), selection):
+                for position, program in zip(positions, programs):
+                    children[position] = program
+            yield tuple(children)
@@ -0,0 +1,165 @@
+'''
+SEARCH OPTIONS
+This file contains the Python class that holds the options of the synthesis engine in synthesis.py, and
+the command line arguments shared by the entry points that run the engine (synthesis.py, batch.py, and
+benchmark.py).
+'''
+
+# load libraries
+import argparse
+import time
+
+
+class SearchOptions:
+    '''
+    Class to represent the options of a search with synthesize(). Every option defaults to the plain
+    bottom-up search, so only the options that differ need to be given.
+
+    Args:
+        complete (bool): enumerate ordered argument tuples with repetition, rather than combinations
+        backend (str): evaluation backend, either "python" or "numpy" (see vectorized.py)
+        workers (int): number of worker processes used to enumerate each level (see parallel.py)
+        max_bank_size (int): maximum number of programs stored in the program bank
+        memory_limit (float): maximum memory usage in MB; once either limit is reached, remaining
+            programs are checked without being stored
+        top_k (int): number of solutions to find, in order of increasing weight (or None for all)
+        cache_dir (str): directory in which to cache the program bank after each level, which is only read
+            if top_k is 1, since the cached bank holds a single program per output signature (see bank_cache.py)
+        checkpoint (str): directory in which to write checkpoints of the search after each level
+        checkpoint_interval (float): also write a checkpoint every checkpoint_interval seconds
+        resume (bool): resume the search from the checkpoint in checkpoint, skipping the candidates of the
+            interrupted level already in the bank; solutions found before the checkpoint are not yielded again
+        instrument (bool): record counters and timers of each level and operator (see instrumentation.py)
+        max_magnitude (int): prune programs with an integer output of greater magnitude, which together with
+            the "floor" or "exact" division modes keeps every value in the bank a machine integer
+        goal_directed (bool): only store string programs whose outputs are substrings of the target outputs;
+            incomplete, as solutions that take a substring of a longer string are no longer found
+        inverse (bool): look up solutions with an invertible top-level operator after each level (see
+            inverse.py); solutions are found levels earlier, but may not be the smallest
+        subset (int): search on a working subset of this many examples, adding each counterexample to the
+            subset and restarting the search from weight 2, so that no solution is missed
+        stop (object): object with an is_set() method (e.g., a threading.Event or a Deadline), checked before
+            each candidate; once set, the search ends early with a "done" event marked as stopped
+
+    Example:
+        options = SearchOptions(backend = "numpy", top_k = 3)
+        for event in synthesize(example_set["addition"], arithmetic_operators, 5, options):
+            ...
+    '''
+
+    def __init__(self, complete = False, backend = "python", workers = 1, max_bank_size = None,
+                 memory_limit = None, top_k = 1, cache_dir = None, checkpoint = None,
+                 checkpoint_interval = None, resume = False, instrument = False, max_magnitude = None,
+                 goal_directed = False, inverse = False, subset = None, stop = None):
+        self.complete = complete                        # enumerate ordered argument tuples with repetition
+        self.backend = backend                          # evaluation backend
+        self.workers = workers                          # number of worker processes
+        self.max_bank_size = max_bank_size              # maximum number of programs in the program bank
+        self.memory_limit = memory_limit                # maximum memory usage in MB
+        self.top_k = top_k                              # number of solutions to find
+        self.cache_dir = cache_dir                      # directory in which to cache the program bank
+        self.checkpoint = checkpoint                    # directory in which to write checkpoints
+        self.checkpoint_interval = checkpoint_interval  # interval in seconds between checkpoints within a level
+        self.resume = resume                            # resume the search from the checkpoint
+        self.instrument = instrument                    # record counters and timers
+        self.max_magnitude = max_magnitude              # maximum magnitude of integer outputs
+        self.goal_directed = goal_directed              # prune string programs by the target outputs
+        self.inverse = inverse                          # look up solutions with an invertible operator
+        self.subset = subset                            # size of the initial working subset of examples
+        self.stop = stop                                # flag on which to end the search early
+
+    def check(self, targets = None, warm_bank = None):
+        '''
+        Check that the options can be combined with each other and with the targets and warm bank of a
+        search, raising a ValueError otherwise.
+        '''
+
+        if (self.resume or self.checkpoint_interval is not None) and self.checkpoint is None:
+            raise ValueError("resume and checkpoint_interval require checkpoint.")
+
+        # subsetting changes the examples during the search, which these options assume are fixed
+        if self.subset is not None:
+            fixed = {"targets": targets is not None, "warm_bank": warm_bank is not None,
+                     "cache_dir": self.cache_dir is not None, "checkpoint": self.checkpoint is not None,
+                     "goal_directed": self.goal_directed, "inverse": self.inverse}
+            conflicts = [name for name, used in fixed.items() if used]
+            if len(conflicts) > 0:
+                raise ValueError(f"subset cannot be combined with {', '.join(conflicts)}.")
+
+
+class Deadline:
+    '''
+    Class to represent a deadline after which a search is stopped, which can be passed as the stop option.
+    The deadline can be renewed while the search is running, so that it also serves as a lease.
+
+    Args:
+        seconds (float): number of seconds from now after which the deadline is set
+
+    Example:
+        options = SearchOptions(stop = Deadline(60))
+    '''
+
+    def __init__(self, seconds):
+        self.renew(seconds)
+
+    def renew(self, seconds):
+        '''
+        Move the deadline to seconds from now (i.e., set it immediately if seconds is 0).
+        '''
+
+        self.deadline = time.monotonic() + seconds
+
+    def is_set(self):
+        '''
+        Returns True if the deadline has passed.
+        '''
+
+        return time.monotonic() >= self.deadline
+
+
+def options_from_args(args, parser = None, **options):
+    '''
+    Returns the search options given by parsed command line arguments, i.e., every attribute of args
+    named after an option, overridden by any options passed as keyword arguments. If the parser is given,
+    options that cannot be combined are reported with parser.error() rather than raised as a ValueError.
+    '''
+
+    names = vars(SearchOptions()).keys()
+    search_options = SearchOptions(**{**{name: getattr(args, name) for name in names if hasattr(args, name)}, **options})
+    if parser is not None:
+        try:
+            search_options.check()
+        except ValueError as error:
+            parser.error(str(error))
+    return search_options
+
+
+# SHARED ARGUMENTS
+def search_parser(bank = True, backend = True):
+    '''
+    Returns a parent parser with the command line arguments of the search shared by the entry points. If
+    backend is True, the arguments that select the evaluation backend and the number of workers are
+    included, and if bank is True, the arguments that bound or cache the program bank are included as well.
+    '''
+
+    parser = argparse.ArgumentParser(add_help=False)
+
+    parser.add_argument('--complete', action='store_true',
+                        help='Enumerate ordered argument tuples with repetition (e.g., x1 - x0 and x0 * x0), skipping mirrored tuples for commutative operators.')
+
+    if backend:
+        parser.add_argument('--backend', type=str, required=False, default="python",
+                            choices=["python", "numpy"],
+                            help='Evaluation backend. The "numpy" backend evaluates binary arithmetic operators over whole buckets of the program bank at once.')
+
+        parser.add_argument('--workers', type=int, required=False, default=1,
+                            help='Number of worker processes used to enumerate each level of the search.')
+
+    if bank:
+        parser.add_argument('--max-bank-size', type=int, required=False, default=None,
+                            help='Maximum number of programs to store in the program bank. Once reached, remaining programs are checked without being stored.')
+
+        parser.add_argument('--cache-dir', type=str, required=False, default=None,
+                            help='Directory in which to cache the program bank, so that searches with the same inputs resume from the deepest cached level.')
+
+    return parser
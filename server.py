@@ -0,0 +1,302 @@
+'''
+SYNTHESIS SERVER
+This file contains a long-running local synthesis server, so that callers can synthesize many programs
+without paying the startup cost of Python and NumPy, and without rebuilding the program bank, for each
+task. The server has an asyncio HTTP front end, which accepts JSON requests of the form:
+
+    POST /synthesize
+    {"domain": "arithmetic", "examples": [[[7, 2], 9], [[8, 1], 9]], "max_weight": 5, "complete": false}
+
+and responds with the program found (or null), its weight, and the time of the search. The "domain" key
+is optional, and is inferred from the types of the examples if omitted. GET /status reports counters of
+the server.
+
+Since a single request could otherwise tie up a worker indefinitely, requests may not search beyond
+MAX_WEIGHT, each search is stopped after SEARCH_TIMEOUT seconds (and reported as timed out), and the
+program bank of each search stores at most MAX_BANK_SIZE programs. All three can be set on the command line.
+
+Searches run in a pool of worker processes. Each worker keeps the program banks of the input sets it has
+recently seen in memory (at most WARM_BANKS_PER_WORKER), and requests are routed to workers by a hash of
+their domain, inputs, and enumeration mode, so that a later request with the same inputs (even with
+different outputs) extends the warm bank rather than starting over. Identical requests that arrive while
+a search is in flight are coalesced into that search.
+
+Example of usage:
+python server.py --port 8765 --workers 4
+curl -X POST localhost:8765/synthesize -d '{"examples": [[[7, 2], 9], [[8, 1], 9]], "max_weight": 3}'
+'''
+
+# load libraries
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import multiprocessing
+import time
+
+# import synthesizer
+from program_bank import ProgramBank
+from bank_cache import bank_key
+from batch import infer_domain
+from examples import check_examples
+from synthesis import synthesize, get_operators, extract_constants
+from search_options import SearchOptions, Deadline
+
+# maximum number of program banks kept in memory by each worker process
+WARM_BANKS_PER_WORKER = 8
+
+# maximum weight a request may search up to, number of seconds after which a search is stopped, and
+# maximum number of programs stored in the program bank of a search
+MAX_WEIGHT = 9
+SEARCH_TIMEOUT = 60.0
+MAX_BANK_SIZE = 2000000
+
+# warm program banks of a worker process, mapping bank key to (bank, weight) in least recently used order
+warm_banks = collections.OrderedDict()
+
+
+# PARSE ARGUMENTS
+def parse_args():
+    '''
+    Parse command line arguments.
+    '''
+
+    parser = argparse.ArgumentParser(description="Local bottom-up enumerative synthesis server.")
+
+    parser.add_argument('--host', type=str, required=False, default="127.0.0.1",
+                        help='Host to listen on.')
+
+    parser.add_argument('--port', type=int, required=False, default=8765,
+                        help='Port to listen on.')
+
+    parser.add_argument('--unix-socket', type=str, required=False, default=None,
+                        help='Path of a Unix socket to listen on instead of a TCP port.')
+
+    parser.add_argument('--workers', type=int, required=False, default=2,
+                        help='Number of worker processes running searches.')
+
+    parser.add_argument('--max-weight', type=int, required=False, default=MAX_WEIGHT,
+                        help='Maximum weight a request may search up to. Requests beyond it are rejected.')
+
+    parser.add_argument('--timeout', type=float, required=False, default=SEARCH_TIMEOUT,
+                        help='Number of seconds after which a search is stopped and reported as timed out.')
+
+    parser.add_argument('--max-bank-size', type=int, required=False, default=MAX_BANK_SIZE,
+                        help='Maximum number of programs to store in the program bank of a search.')
+
+    args = parser.parse_args()
+    return args
+
+
+# RUN SEARCH IN WORKER
+def run_search(request, timeout = SEARCH_TIMEOUT, max_bank_size = MAX_BANK_SIZE):
+    '''
+    Run a search in a worker process, extending the warm program bank of the inputs of the request if
+    there is one, and stopping after timeout seconds. Returns a JSON-serializable result.
+    '''
+
+    examples = [(list(input), output) for input, output in request["examples"]]
+    operators = get_operators(request["domain"])
+    key = bank_key(operators, examples, request["complete"])
+
+    # retrieve warm program bank, or construct a new program bank from the examples
+    warm = key in warm_banks
+    if warm:
+        bank, weight = warm_banks.pop(key)
+    else:
+        bank, weight = ProgramBank(examples), 1
+        for p in extract_constants(examples):
+            bank.add(p)
+
+    # run search, tracking the deepest complete level of the program bank
+    start_weight = weight
+    start_time = time.time()
+    program = None
+    timed_out = False
+    options = SearchOptions(complete = request["complete"], max_bank_size = max_bank_size, stop = Deadline(timeout))
+    for event in synthesize(examples, operators, request["max_weight"], options, warm_bank = (bank, weight)):
+        if event["event"] == "level":
+            weight = max(weight, event["weight"] - 1)
+
+        # the warm bank may be deeper than the request, so heavier programs are not solutions
+        elif event["event"] == "solution" and event["program"].weight <= request["max_weight"]:
+            program = event["program"]
+
+        # the last level is only complete if the search was neither stopped nor stopped storing programs,
+        # but a bank that was already full keeps the complete levels it had (full_weight is then 1)
+        elif event["event"] == "done":
+            timed_out = event["stopped"]
+            if program is None and not timed_out:
+                weight = max(weight, request["max_weight"])
+            if event["full_weight"] is not None:
+                weight = min(weight, max(event["full_weight"] - 1, start_weight))
+    elapsed_time = time.time() - start_time
+
+    # keep program bank warm, evicting the least recently used program bank
+    warm_banks[key] = (bank, weight)
+    while len(warm_banks) > WARM_BANKS_PER_WORKER:
+        warm_banks.popitem(last=False)
+
+    return {
+        "program": None if program is None else program.str(),
+        "weight": None if program is None else program.weight,
+        "time": round(elapsed_time, 4),
+        "warm": warm,
+        "bank_size": len(bank),
+        "timed_out": timed_out,
+    }
+
+
+class SynthesisServer:
+    '''
+    Class to represent the asyncio front end of the synthesis server, which parses requests, coalesces
+    identical requests, and routes searches to worker processes.
+
+    Args:
+        workers (int): number of worker processes
+        max_weight (int): maximum weight a request may search up to
+        timeout (float): number of seconds after which a search is stopped
+        max_bank_size (int): maximum number of programs stored in the program bank of a search
+
+    Example:
+        server = SynthesisServer(workers = 2)
+        asyncio.run(server.serve("127.0.0.1", 8765))
+    '''
+
+    def __init__(self, workers = 2, max_weight = MAX_WEIGHT, timeout = SEARCH_TIMEOUT, max_bank_size = MAX_BANK_SIZE):
+
+        # each worker is a single process, so that searches with the same key share its warm banks
+        context = multiprocessing.get_context("spawn")
+        self.workers = [concurrent.futures.ProcessPoolExecutor(1, mp_context=context) for _ in range(workers)]
+        self.in_flight = {}     # dictionary mapping request key to future of the search in flight
+        self.counters = {"requests": 0, "searches": 0, "coalesced": 0, "errors": 0, "timeouts": 0}
+        self.max_weight = max_weight
+        self.timeout = timeout
+        self.max_bank_size = max_bank_size
+
+    async def synthesize(self, request):
+        '''
+        Returns the result of a synthesis request, joining the search in flight for an identical request.
+        '''
+
+        # validate request, inferring domain from examples if not provided
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object.")
+        examples = [(list(input), output) for input, output in request["examples"]]
+        check_examples(examples)
+        request = {
+            "domain": request.get("domain") or infer_domain(examples),
+            "examples": examples,
+            "max_weight": int(request.get("max_weight", 3)),
+            "complete": bool(request.get("complete", False)),
+        }
+        if request["domain"] not in ["arithmetic", "strings"]:
+            raise ValueError(f'Unknown domain {request["domain"]!r}. Must be either "arithmetic" or "strings".')
+        if not 1 <= request["max_weight"] <= self.max_weight:
+            raise ValueError(f"max_weight must be between 1 and {self.max_weight}.")
+        key = json.dumps(request, sort_keys=True)
+
+        # coalesce identical requests into a single search
+        if key in self.in_flight:
+            self.counters["coalesced"] += 1
+            return {**await asyncio.shield(self.in_flight[key]), "coalesced": True}
+
+        # route search to worker by bank key, so that searches with the same inputs share warm banks
+        bank = bank_key(get_operators(request["domain"]), examples, request["complete"])
+        worker = self.workers[int(bank, 16) % len(self.workers)]
+        future = asyncio.get_running_loop().run_in_executor(worker, run_search, request, self.timeout,
+                                                            self.max_bank_size)
+        self.in_flight[key] = future
+        self.counters["searches"] += 1
+        try:
+            result = await asyncio.shield(future)
+            self.counters["timeouts"] += result["timed_out"]
+            return {**result, "coalesced": False}
+        finally:
+            self.in_flight.pop(key, None)
+
+    async def route(self, method, path, body):
+        '''
+        Returns the status code and JSON response to an HTTP request.
+        '''
+
+        if method == "GET" and path == "/status":
+            return 200, {**self.counters, "in_flight": len(self.in_flight), "workers": len(self.workers)}
+
+        if method == "POST" and path == "/synthesize":
+            self.counters["requests"] += 1
+            try:
+                return 200, await self.synthesize(json.loads(body))
+            except (ValueError, KeyError, TypeError) as error:
+                self.counters["errors"] += 1
+                return 400, {"error": str(error)}
+            except Exception as error:
+                self.counters["errors"] += 1
+                return 500, {"error": f"Search failed: {error!r}"}
+
+        return 404, {"error": f"No route for {method} {path}."}
+
+    async def handle(self, reader, writer):
+        '''
+        Handle an HTTP connection, reading a single request and writing a JSON response.
+        '''
+
+        try:
+            # read request line, headers, and body
+            method, path, _ = (await reader.readline()).decode().split()
+            headers = {}
+            while (line := (await reader.readline()).decode().strip()):
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            status, response = await self.route(method, path, body)
+        except (ValueError, asyncio.IncompleteReadError):
+            status, response = 400, {"error": "Malformed HTTP request."}
+
+        # write response
+        content = json.dumps(response).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(content)}\r\nConnection: close\r\n\r\n".encode() + content)
+        await writer.drain()
+        writer.close()
+
+    async def serve(self, host = "127.0.0.1", port = 8765, unix_socket = None):
+        '''
+        Serve requests on a TCP port or a Unix socket until cancelled.
+        '''
+
+        if unix_socket is None:
+            server = await asyncio.start_server(self.handle, host, port)
+        else:
+            server = await asyncio.start_unix_server(self.handle, unix_socket)
+
+        async with server:
+            await server.serve_forever()
+
+    def shutdown(self):
+        '''
+        Shut down the worker processes.
+        '''
+
+        for worker in self.workers:
+            worker.shutdown(cancel_futures=True)
+
+
+if __name__ == '__main__':
+
+    # parse command line arguments
+    args = parse_args()
+
+    # run server until interrupted
+    server = SynthesisServer(args.workers, args.max_weight, args.timeout, args.max_bank_size)
+    address = args.unix_socket if args.unix_socket is not None else f"http://{args.host}:{args.port}"
+    print(f"- Serving synthesis requests at {address} with {args.workers} workers.")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
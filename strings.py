@@ -12,10 +12,13 @@ class StringVariable:
     Class to represent an string variable. Note that position is the position of the variable in the input.
     For example, if the input is ["a", "b", "c"] and the variable is the third element (i.e., "c"), then position = 2.
     '''
+    __slots__ = ("position", "type", "weight", "values")
+
     def __init__(self, position):
         self.position = position    # zero-indexed position of the variable in the arguments to program
         self.type = str             # type of the variable
         self.weight = 1             # weight of the variable
+        self.values = None          # cached output vector on the example inputs
 
     def evaluate(self, input = None):
 
@@ -36,6 +39,11 @@ class StringVariable:
             raise ValueError(f"Position {self.position} is out of range for input of length {len(input)}.")
 
         return input[self.position]
+
+    def evaluate_vector(self, inputs):
+        if self.values is None:
+            self.values = tuple([self.evaluate(input) for input in inputs])
+        return self.values
     
     def str(self):
         return f"x{self.position}"
@@ -44,13 +52,21 @@ class StringConstant:
     '''
     Class to represent an string constant.
     '''
+    __slots__ = ("value", "type", "weight", "values")
+
     def __init__(self, value):
         self.value = value  # value of the constant
         self.type = str     # type of the constant
         self.weight = 1     # weight of the constant
+        self.values = None  # cached output vector on the example inputs
 
     def evaluate(self, input = None):
         return self.value
+
+    def evaluate_vector(self, inputs):
+        if self.values is None:
+            self.values = tuple([self.value for input in inputs])
+        return self.values
     
     def str(self):
         return str(self.value)
@@ -59,15 +75,26 @@ class Concatenate:
     '''
     Operator to concatenate two string values.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [str, str]     # argument types
+        self.arg_types = (str, str)     # argument types
         self.return_type = str          # return type
         self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         return x + y
     
+    def inverse(self, output, operand, position):
+        if position == 0: # operand is a prefix of the output
+            return output[len(operand):] if output.startswith(operand) else None
+        return output[:len(output) - len(operand)] if output.endswith(operand) else None
+
+    def compile(self, x, y):
+        return f"({x} + {y})"
+
     def str(self, x, y):
         return f"Concat({x}, {y})"
 
@@ -75,15 +102,21 @@ class Left:
     '''
     Operator to get left substring.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [str, int]     # argument types
+        self.arg_types = (str, int)     # argument types
         self.return_type = str          # return type
         self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         return x[:y]
     
+    def compile(self, x, y):
+        return f"{x}[:{y}]"
+
     def str(self, x, y):
         return f"Left({x}, {y})"
     
@@ -91,15 +124,21 @@ class Right:
     '''
     Operator to get right substring.
     '''
+    __slots__ = ("arity", "arg_types", "return_type", "weight", "commutative")
+
     def __init__(self):
         self.arity = 2                  # number of arguments
-        self.arg_types = [str, int]     # argument types
+        self.arg_types = (str, int)     # argument types
         self.return_type = str          # return type
         self.weight = 1                 # weight
+        self.commutative = False        # whether arguments can be swapped
 
     def evaluate(self, x, y, input = None):
         return x[(y * -1):]
     
+    def compile(self, x, y):
+        return f"{x}[({y} * -1):]"
+
     def str(self, x, y):
         return f"Right({x}, {y})" 
 
@@ -10,16 +10,28 @@ python synthesis.py --domain arithmetic --examples addition
 # load libraries
 import numpy as np
 import argparse
-import itertools
+import json
+import resource
 import time
+import sys
 
 # import examples
 from arithmetic import *
 from strings import *
 from abstract_syntax_tree import *
+from program_bank import ProgramBank
+from enumeration import level_candidates, candidate_position
+from parallel import parallel_candidates
+from bank_cache import bank_key, cache_path, load_bank, save_bank
+from instrumentation import SearchStatistics
+from search_options import SearchOptions, options_from_args, search_parser
+from inverse import inverse_solution
 from examples import example_set, check_examples
 import config
 
+# number of programs added to the program bank between checks of memory usage
+MEMORY_CHECK_INTERVAL = 1024
+
 
 # PARSE ARGUMENTS
 def parse_args():
@@ -27,7 +39,7 @@ def parse_args():
     Parse command line arguments.
     '''
 
-    parser = argparse.ArgumentParser(description="Bottom-up enumerative synthesis in Python.")
+    parser = argparse.ArgumentParser(description="Bottom-up enumerative synthesis in Python.", parents=[search_parser()])
 
     # define valid choices for the 'domain' argument
     valid_domain_choices = ["arithmetic", "strings"]
@@ -44,7 +56,46 @@ def parse_args():
     parser.add_argument('--max-weight', type=int, required=False, default=3,
                         help='Maximum weight of programs to consider before terminating search.')
 
+    parser.add_argument('--memory-limit', type=float, required=False, default=None,
+                        help='Maximum memory usage in MB. Once reached, remaining programs are checked without being stored.')
+
+    parser.add_argument('--top-k', type=int, required=False, default=1,
+                        help='Number of satisfying programs to find before terminating search, in order of increasing weight.')
+
+    parser.add_argument('--checkpoint', type=str, required=False, default=None,
+                        help='Directory in which to write checkpoints of the search after each level.')
+
+    parser.add_argument('--checkpoint-interval', type=float, required=False, default=None,
+                        help='Also write a checkpoint every CHECKPOINT_INTERVAL seconds within a level.')
+
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume the search from the checkpoint in the --checkpoint directory.')
+
+    parser.add_argument('--division', type=str, required=False, default="true",
+                        choices=["true", "floor", "exact"],
+                        help='Division mode of the arithmetic domain: true division, integer division rounded down, or integer division only defined if exact.')
+
+    parser.add_argument('--max-magnitude', type=int, required=False, default=None,
+                        help='Prune programs with an integer output of magnitude greater than MAX_MAGNITUDE.')
+
+    parser.add_argument('--goal-directed', action='store_true',
+                        help='Only store string programs whose outputs are substrings of the target outputs. Much faster, but may miss solutions that take substrings of longer strings.')
+
+    parser.add_argument('--inverse', action='store_true',
+                        help='After each level, look up solutions whose top-level operator is Add, Subtract, or Concatenate by inverting the target outputs. Finds solutions levels earlier, but they may not be the smallest.')
+
+    parser.add_argument('--subset', type=int, required=False, default=None,
+                        help='Search on a working subset of SUBSET examples, checking solutions against all examples. The first failing example is added to the working subset, and the search restarts from weight 2.')
+
+    parser.add_argument('--statistics', type=str, required=False, default=None,
+                        help='JSON file to write counters and timers of the search in each level and for each operator to.')
+
     args = parser.parse_args()
+
+    # check that the options of the search can be combined (e.g., that a checkpoint directory is given
+    # when resuming, or that subsetting is not combined with caching)
+    options_from_args(args, parser)
+
     return args
 
 
@@ -121,76 +172,492 @@ def check_program(program, examples):
     return program_output == outputs
 
 
-# RUN SYNTHESIZER
-def run_synthesizer(args):
+def find_counterexample(program, examples):
     '''
-    Run bottom-up enumerative synthesis.
+    Returns the first input-output example that the program does not satisfy, or None if the program
+    satisfies all examples.
     '''
 
-    # retrieve selected input-output examples
-    examples = example_set[args.examples_key]
+    for example in examples:
+        if program.evaluate(example[0]) != example[1]:
+            return example
+    return None
 
-    # extract constants from examples
-    program_bank = extract_constants(examples)
-    program_bank_str = [p.str() for p in program_bank]
-    print("\nSynthesis Log:")
-    print(f"- Extracted {len(program_bank)} constants from examples.")
 
-    # define operators
-    if args.domain == "arithmetic":
-        operators = arithmetic_operators
-    elif args.domain == "strings":
-        operators = string_operators
+# CHECK MEMORY LIMITS
+def memory_usage():
+    '''
+    Returns the peak resident set size of the process in MB.
+    '''
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # note that ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / 1024 ** 2
+    return peak / 1024
+
+
+def bank_limit_reached(program_bank, max_bank_size = None, memory_limit = None):
+    '''
+    Returns True if the program bank has reached its maximum size or if the process has reached its
+    memory limit. Memory usage is only checked every MEMORY_CHECK_INTERVAL programs to keep the check cheap.
+    '''
+
+    if max_bank_size is not None and len(program_bank) >= max_bank_size:
+        return True
+
+    if memory_limit is not None and len(program_bank) % MEMORY_CHECK_INTERVAL == 0:
+        return memory_usage() >= memory_limit
+
+    return False
+
+
+# CHECK GOAL
+def matches_goal(signature, goals):
+    '''
+    Returns True if, for some target output signature in goals, the output of a string program on each
+    input is a substring of the target output on that input.
+    '''
+    return any([all([value in target for value, target in zip(signature, goal)]) for goal in goals])
+
+
+# GET OPERATORS
+def get_operators(domain, division = "true"):
+    '''
+    Returns the operators of the domain-specific language of a domain. For the arithmetic domain, the
+    division mode selects the division operator, i.e., true division ("true"), integer division rounded
+    down ("floor"), or integer division that is only defined if exact ("exact").
+    '''
+
+    if domain == "arithmetic":
+        return [op for op in arithmetic_operators if not isinstance(op, Divide)] + [division_operators[division]]
+    elif domain == "strings":
+        return string_operators
     else:
         raise Exception('Domain not recognized. Must be either "arithmetic" or "string".')
 
-    # iterate over each level
-    for weight in range(2, args.max_weight):
 
-        # print message
-        print(f"- Searching level {weight} with {len(program_bank)} primitives.")
+# SYNTHESIS ENGINE
+def synthesize(examples, operators, max_weight, options = None, targets = None, warm_bank = None):
+    '''
+    Run bottom-up enumerative synthesis as a generator, with the options of the search given as a
+    SearchOptions object (see search_options.py). The generator yields events as dictionaries with an
+    "event" key, in the following order:
+
+        {"event": "start", "constants": ...}: constants and variables have been extracted
+        {"event": "cache", "weight": ..., "bank_size": ...}: the program bank was loaded from the cache
+        {"event": "resume", "weight": ..., "bank_size": ...}: the search was resumed from a checkpoint
+        {"event": "level", "weight": ..., "bank_size": ...}: the search of a level has started
+        {"event": "bank_full", "weight": ..., "bank_size": ...}: the program bank limit has been reached
+        {"event": "checkpoint", "weight": ..., "bank_size": ...}: a checkpoint was written
+        {"event": "statistics", "weight": ..., "time": ..., "bank_size": ..., "operators": ...}: the
+            search of a level has ended, with counters and timers of each operator (if instrumented)
+        {"event": "counterexample", "example": ..., "examples": ..., "bank_size": ...}: a counterexample
+            was added to the working examples (if subsetting)
+        {"event": "solution", "program": ..., "rank": ..., "target": ...}: a satisfying program was found
+        {"event": "done", "solutions": ..., "full_weight": ..., "unstored": ..., "bank_size": ...,
+            "candidates": ..., "pruned": ..., "statistics": ..., "examples": ..., "stopped": ...}: the
+            search has ended
+
+    Solutions are yielded as soon as they are found, in order of increasing weight (unless inverse
+    lookup is on). Since all solutions have the same outputs, candidates are checked against the examples
+    before they are checked for observational equivalence, so that programs equivalent to earlier solutions
+    are still found. The "done" event reports the weight from which programs were no longer stored if the
+    program bank limit was reached (full_weight), the number of candidates checked, and the number pruned
+    by each rule (candidates skipped by the NumPy backend or by worker processes are not counted), and
+    whether the search was stopped early by the stop option, in which case the last level is incomplete.
+
+    If targets is provided, the search instead looks for programs whose outputs match any of the given
+    output vectors, so that a single enumeration can serve many tasks that share the same inputs, and a
+    single solution is found for each target. A program bank held in memory can be passed as warm_bank,
+    as a tuple (bank, weight) where weight is the deepest complete level of the bank, which the search
+    extends in place. The bank must have been enumerated with the same inputs, operators, and options.
+
+    Example:
+        for event in synthesize(example_set["addition"], arithmetic_operators, 3):
+            if event["event"] == "solution":
+                print(event["program"].str()) # prints "(x0 + x1)"
+    '''
+
+    # check options, and unpack them
+    options = SearchOptions() if options is None else options
+    options.check(targets, warm_bank)
+    complete, backend, workers = options.complete, options.backend, options.workers
+    max_bank_size, memory_limit, top_k = options.max_bank_size, options.memory_limit, options.top_k
+    cache_dir, checkpoint, checkpoint_interval = options.cache_dir, options.checkpoint, options.checkpoint_interval
+    resume, max_magnitude, subset, stop = options.resume, options.max_magnitude, options.subset, options.stop
+
+    # record counters and timers of each level and operator if instrumented
+    statistics = SearchStatistics() if options.instrument else None
+
+    # search on a working subset of the examples if subsetting
+    all_examples = examples
+    if subset is not None:
+        examples = examples[:max(subset, 1)]
+
+    # define target string output signatures to which string programs are restricted if goal-directed
+    goals = None
+    if options.goal_directed:
+        goals = [tuple([example[1] for example in examples])] if targets is None else [tuple(target) for target in targets]
+        goals = [goal for goal in goals if all([type(value) == str for value in goal])]
+
+    # define search state, which is saved with checkpoints
+    key = bank_key(operators, examples, complete, max_magnitude, goals)
+    state = {"key": key, "solutions": 0, "unstored": 0, "full_weight": None, "position": None,
+             "candidates": 0, "pruned": {"error": 0, "magnitude": 0, "goal": 0, "equivalence": 0}}
+
+    # load program bank from checkpoint, memory, or cache if available
+    cached = None
+    if cache_dir is not None:
+        path = cache_path(cache_dir, operators, examples, complete, max_magnitude, goals)
+    if resume:
+        cached = load_bank(checkpoint, examples, operators)
+        if cached is None or cached[2]["key"] != key:
+            raise ValueError(f"No checkpoint for these examples and operators found in {checkpoint}.")
+    elif warm_bank is not None:
+        program_bank, cached_weight = warm_bank
+        program_bank.target = tuple([example[1] for example in examples])
+        cached = (program_bank, cached_weight, None)
+    elif cache_dir is not None and top_k == 1:
+        cached = load_bank(path, examples, operators)
+
+    # otherwise, extract constants from examples (all examples, if subsetting)
+    if cached is None:
+        program_bank, cached_weight = ProgramBank(examples), 1
+        for p in extract_constants(all_examples):
+            program_bank.add(p)
+        yield {"event": "start", "constants": len(program_bank)}
+    elif resume:
+        program_bank, cached_weight, state = cached
+        yield {"event": "resume", "weight": cached_weight + 1, "bank_size": len(program_bank)}
+    else:
+        program_bank, cached_weight, _ = cached
+        yield {"event": "cache", "weight": min(cached_weight, max_weight), "bank_size": len(program_bank)}
+
+    # define target output signatures, and the number of solutions to find for each target
+    # by default, top_k solutions are found for the outputs of the examples; if targets are provided,
+    # a single solution is found for each target, and equivalent solutions are not enumerated
+    if targets is None:
+        remaining = {program_bank.target: None if top_k is None else top_k - state["solutions"]}
+    else:
+        program_bank.target = None
+        remaining = {tuple(target): 1 for target in targets}
+    open_targets = len([count for count in remaining.values() if count != 0])
+
+    # record a solution, and return True if solutions have been found for all targets
+    def record_solution(signature):
+        nonlocal open_targets
+        state["solutions"] += 1
+        if remaining[signature] is not None:
+            remaining[signature] -= 1
+            if remaining[signature] == 0:
+                open_targets -= 1
+        return open_targets == 0
+
+    # once the program bank is full, new programs are checked without being stored
+    bank_full = state["full_weight"] is not None or bank_limit_reached(program_bank, max_bank_size, memory_limit)
+    if bank_full and state["full_weight"] is None:
+        state["full_weight"] = 1
+        yield {"event": "bank_full", "weight": 1, "bank_size": len(program_bank)}
+
+    # write a checkpoint of the program bank and the search state
+    def write_checkpoint(weight, position):
+        state["position"] = position
+        save_bank(checkpoint, program_bank, operators, weight - 1, state)
+        return {"event": "checkpoint", "weight": weight, "bank_size": len(program_bank)}
+
+    # report the end of the search
+    def done_event(stopped = False):
+        return {"event": "done", "solutions": state["solutions"], "full_weight": state["full_weight"],
+                "unstored": state["unstored"], "bank_size": len(program_bank),
+                "candidates": state["candidates"], "pruned": state["pruned"],
+                "statistics": None if statistics is None else statistics.finish(len(program_bank)),
+                "examples": len(program_bank.inputs), "stopped": stopped}
+
+    # add a counterexample to the working examples, and rebuild the program bank from the constants and
+    # variables, since programs discarded as equivalent on the previous examples may now be distinct
+    def add_counterexample(example):
+        nonlocal examples, program_bank, remaining
+        count = remaining.pop(program_bank.target)
+        examples = examples + [example]
+        program_bank = ProgramBank(examples)
+        for p in extract_constants(all_examples):
+            program_bank.add(p)
+        remaining = {program_bank.target: count}
+        return {"event": "counterexample", "example": example, "examples": len(examples),
+                "bank_size": len(program_bank)}
+
+    # check if any constant, variable, or cached program passes all examples, and return "finished" if
+    # solutions have been found for all targets, or "restart" if a counterexample was added
+    # note that a cached or warm program bank may be deeper than max_weight, so heavier programs are skipped
+    def check_bank():
+        for program in ([] if resume else list(program_bank.programs)):
+            if program.weight > max_weight:
+                continue
+            signature = program_bank.signature(program)
+            if signature is not ERROR and remaining.get(signature, 0) != 0 and program.str() not in solution_strings:
+
+                # check program against all examples if subsetting
+                if subset is not None:
+                    example = find_counterexample(program, all_examples)
+                    if example is not None:
+                        yield add_counterexample(example)
+                        return "restart"
+
+                solution_strings.add(program.str())
+                finished = record_solution(signature)
+                yield {"event": "solution", "program": program, "rank": state["solutions"], "target": signature}
+                if finished:
+                    return "finished"
+        return None
+
+    # look up solutions op(a, b) with an invertible operator, where a was added to the program bank since
+    # the last lookup, and return True if solutions have been found for all targets
+    solution_strings = set()    # solutions yielded so far, which are not yielded again
+    inverse_checked = 0
+    def inverse_lookup():
+        nonlocal inverse_checked
+        programs = program_bank.programs[inverse_checked:]
+        inverse_checked = len(program_bank)
+        for signature, count in list(remaining.items()):
+            if count == 0:
+                continue
+            program = inverse_solution(program_bank, operators, programs, signature, max_weight)
+            if program is not None:
+                solution_strings.add(program.str())
+                finished = record_solution(signature)
+                yield {"event": "solution", "program": program, "rank": state["solutions"], "target": signature}
+                if finished:
+                    return True
+        return False
+
+    # check the programs in the program bank, again after each counterexample
+    while (checked := (yield from check_bank())) == "restart":
+        pass
+    if checked == "finished" or (options.inverse and (yield from inverse_lookup())):
+        yield done_event()
+        return
+
+    # iterate over each level, where each level enumerates the programs of exactly that weight
+    last_checkpoint = time.monotonic()
+    weight = cached_weight + 1
+    while weight <= max_weight:
+        yield {"event": "level", "weight": weight, "bank_size": len(program_bank)}
+        if statistics is not None:
+            statistics.start_level(weight, program_bank, operators, complete)
+
+        # resume from position within level if resuming from a checkpoint
+        start = None
+        if resume and weight == cached_weight + 1 and state["position"] is not None:
+            op_index, partition, row = state["position"]
+            start = (op_index, tuple(partition), row)
+
+        # generate candidate programs of this weight, in parallel if multiple workers are requested
+        if workers > 1:
+            candidates = parallel_candidates(program_bank, operators, weight, complete, backend, workers, start)
+        else:
+            candidates = level_candidates(program_bank, operators, weight, complete, backend, start)
+
+        # iterate over each candidate program
+        restart = False
+        for program in candidates:
+
+            # end the search early if the stop flag has been set
+            if stop is not None and stop.is_set():
+                yield done_event(stopped = True)
+                return
+
+            # write checkpoint if the checkpoint interval has elapsed
+            if checkpoint_interval is not None and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                yield write_checkpoint(weight, candidate_position(program, operators, program_bank))
+                last_checkpoint = time.monotonic()
+
+            # record candidate in the statistics of its operator if instrumented
+            state["candidates"] += 1
+            if statistics is not None:
+                counters = statistics.operator(program)
+                counters["candidates"] += 1
+
+            # check if program passes all examples
+            if statistics is not None:
+                evaluation_start = time.perf_counter()
+            signature = program_bank.signature(program)
+            if statistics is not None:
+                counters["evaluation_time"] += time.perf_counter() - evaluation_start
+
+            # prune program if its output is undefined on any input, as is any program built from it
+            if signature is ERROR:
+                state["pruned"]["error"] += 1
+                if statistics is not None:
+                    counters["rejected_error"] += 1
+                continue
+            # solutions already found (by inverse lookup, or before a counterexample) are not yielded again
+            if remaining.get(signature, 0) != 0 and program.str() not in solution_strings:
+
+                # check program against all examples if subsetting, restarting the search otherwise
+                if subset is not None:
+                    example = find_counterexample(program, all_examples)
+                    if example is not None:
+                        yield add_counterexample(example)
+                        restart = True
+                        break
+
+                solution_strings.add(program.str())
+                finished = record_solution(signature)
+                yield {"event": "solution", "program": program, "rank": state["solutions"], "target": signature}
+                if finished:
+                    yield done_event()
+                    return
+
+            # prune program if any of its integer outputs exceeds the magnitude cap
+            if max_magnitude is not None and program.type == int and max(map(abs, signature)) > max_magnitude:
+                state["pruned"]["magnitude"] += 1
+                if statistics is not None:
+                    counters["rejected_magnitude"] += 1
+                continue
+
+            # prune string program if goal-directed and its outputs are not substrings of the target outputs
+            if goals and program.type == str and not matches_goal(signature, goals):
+                state["pruned"]["goal"] += 1
+                if statistics is not None:
+                    counters["rejected_goal"] += 1
+                continue
+
+            # check if program is observationally equivalent to any program in program bank
+            if statistics is not None:
+                equivalence_start = time.perf_counter()
+                equivalent = signature in program_bank.signatures
+                counters["equivalence_time"] += time.perf_counter() - equivalence_start
+            else:
+                equivalent = signature in program_bank.signatures
+            if equivalent:
+                state["pruned"]["equivalence"] += 1
+                if statistics is not None:
+                    counters["rejected_equivalence"] += 1
+                continue
+
+            # add program to program bank, unless the program bank is full
+            if bank_full:
+                state["unstored"] += 1
+                continue
+            program_bank.add(program)
+            if statistics is not None:
+                counters["stored"] += 1
+
+            # stop storing programs if the limit has been reached
+            bank_full = bank_limit_reached(program_bank, max_bank_size, memory_limit)
+            if bank_full:
+                state["full_weight"] = weight
+                yield {"event": "bank_full", "weight": weight, "bank_size": len(program_bank)}
+
+        # report statistics of the level if instrumented
+        if statistics is not None:
+            yield statistics.end_level(len(program_bank))
+
+        # restart the search from weight 2 on the new working examples if a counterexample was added,
+        # checking the constants and variables again
+        if restart:
+            bank_full = bank_limit_reached(program_bank, max_bank_size, memory_limit)
+            state["full_weight"] = 1 if bank_full else None
+            while (checked := (yield from check_bank())) == "restart":
+                pass
+            if checked == "finished":
+                yield done_event()
+                return
+            weight = 2
+            continue
+
+        # save complete level to cache, unless programs are no longer being stored
+        if cache_dir is not None and not bank_full:
+            save_bank(path, program_bank, operators, weight)
+
+        # write checkpoint at the end of each level
+        if checkpoint is not None:
+            yield write_checkpoint(weight + 1, None)
+            last_checkpoint = time.monotonic()
+
+        # look up solutions with an invertible operator, built from the programs of this level
+        if options.inverse and (yield from inverse_lookup()):
+            yield done_event()
+            return
+        weight += 1
+
+    yield done_event()
+
+
+# RUN SYNTHESIZER
+def run_synthesizer(args, callback = None):
+    '''
+    Run bottom-up enumerative synthesis, printing the synthesis log. Returns the smallest program that
+    satisfies the input-output examples, or None if no program is found.
+
+    If args.statistics is provided, or a callback is given, the search is instrumented. The callback is
+    called with each "statistics" event at the end of a level, and the statistics of all levels are
+    written as JSON to args.statistics (see instrumentation.py).
+
+    Only args.domain, args.examples_key, and args.max_weight are required, so that callers can pass a
+    namespace with just these; every other argument defaults to its command line default.
+    '''
+
+    # read optional arguments, which programmatic callers may not set
+    division = getattr(args, "division", "true")
+    top_k = getattr(args, "top_k", 1)
+    statistics_path = getattr(args, "statistics", None)
+
+    # retrieve selected input-output examples and operators
+    examples = example_set[args.examples_key]
+    operators = get_operators(args.domain, division)
+
+    print("\nSynthesis Log:")
+    programs = []
+    options = options_from_args(args, instrument = statistics_path is not None or callback is not None)
+    for event in synthesize(examples, operators, args.max_weight, options):
+
+        if event["event"] == "start":
+            print(f"- Extracted {event['constants']} constants from examples.")
 
-        # iterate over each operator
-        for op in operators:
+        elif event["event"] == "cache":
+            print(f"- Loaded {event['bank_size']} primitives up to level {event['weight']} from cache.")
 
-            # get all possible combinations of primitives in program bank
-            combinations = itertools.combinations(program_bank, op.arity)
+        elif event["event"] == "resume":
+            print(f"- Resumed search at level {event['weight']} with {event['bank_size']} primitives from checkpoint.")
 
-            # iterate over each combination
-            for combination in combinations:
+        elif event["event"] == "checkpoint":
+            print(f"- Wrote checkpoint at level {event['weight']} with {event['bank_size']} primitives.")
 
-                # get type signature
-                type_signature = [p.type for p in combination]
+        elif event["event"] == "level":
+            print(f"- Searching level {event['weight']} with {event['bank_size']} primitives.")
 
-                # check if type signature matches operator
-                if type_signature != op.arg_types:
-                    continue
+        elif event["event"] == "counterexample":
+            print(f"- Added counterexample {event['example']} to {event['examples']} working examples, with {event['bank_size']} primitives.")
 
-                # check that sum of weights of arguments <= w
-                if sum([p.weight for p in combination]) > weight:
-                    continue
+        elif event["event"] == "bank_full":
+            print(f"- Program bank limit reached with {event['bank_size']} primitives at level {event['weight']}, checking remaining programs without storing them.")
 
-                # create new program
-                program = OperatorNode(op, combination)
+        elif event["event"] == "statistics" and callback is not None:
+            callback(event)
 
-                # check if program is in program bank using string representation
-                if program.str() in program_bank_str:
-                    continue
-                
-                # check if program is observationally equivalent to any program in program bank
-                if any([observationally_equivalent(program, p, examples) for p in program_bank]):
-                    continue
+        elif event["event"] == "solution":
+            programs.append(event["program"])
+            if top_k != 1:
+                print(f"- Found program {event['rank']}: {event['program'].str()}")
 
-                # add program to program bank
-                program_bank.append(program)
-                program_bank_str.append(program.str())
+        elif event["event"] == "done":
+            if event["full_weight"] is not None:
+                print(f"- Search was exhaustive up to weight {event['full_weight'] - 1}.")
+                print(f"- From weight {event['full_weight']}, {event['unstored']} programs built only from stored programs were checked without being stored.")
 
-                # check if program passes all examples
-                if check_program(program, examples):
-                    return(program)    
+            # write statistics of all levels as JSON
+            if statistics_path is not None:
+                with open(statistics_path, "w") as f:
+                    json.dump(event["statistics"], f, indent=2)
+                print(f"- Wrote search statistics to {statistics_path}.")
 
     # return None if no program is found
-    return None 
+    if len(programs) == 0:
+        return None
+    return programs[0]
 
 
 if __name__ == '__main__':
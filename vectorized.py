@@ -0,0 +1,133 @@
+'''
+VECTORIZED EVALUATION
+This file contains the NumPy backend for bottom-up synthesis. Rather than evaluating each candidate
+program one example at a time, the output vectors of all programs in a bucket of the program bank are
+stacked into a single array, and an operator is applied to all pairs of programs from two buckets with
+one broadcasted operation.
+
+Since every program that is not skipped still becomes an OperatorNode in the program bank, the cost of
+constructing and storing new programs, rather than evaluation, bounds the speedup over the Python backend
+(about 1.4x to 2x at weight 7, see the README).
+'''
+
+# load libraries
+import numpy as np
+
+# import AST
+from abstract_syntax_tree import OperatorNode
+
+# largest magnitude stored in a bucket array, so that sums and products of two values fit in int64
+MAX_MAGNITUDE = 2 ** 31
+
+# maximum number of output values computed in a single broadcasted operation
+MAX_BLOCK_SIZE = 2 ** 22
+
+
+# CONSTRUCT BUCKET ARRAY
+def bucket_array(bank, key):
+    '''
+    Returns the output vectors of the programs in a bucket of the program bank as an int64 array of
+    shape (programs, examples), together with a boolean mask of which rows can be evaluated by NumPy.
+
+    Only rows whose outputs are all integers of magnitude at most MAX_MAGNITUDE are vectorized. Other
+    rows (e.g., the float outputs of division, or None) are zero-filled in the array and masked out, so
+    that the corresponding candidates fall back to exact Python evaluation.
+    '''
+
+    # return cached array if bucket has not grown since it was constructed
+    bucket = bank.buckets[key]
+    if key in bank.arrays and len(bank.arrays[key][0]) == len(bucket):
+        return bank.arrays[key]
+
+    # get output vectors of programs in bucket
+    n_examples = len(bank.inputs)
+    vectors = [bank.signature(program) for program in bucket]
+    mask = np.array([all([type(value) == int and abs(value) <= MAX_MAGNITUDE for value in vector])
+                     for vector in vectors], dtype=bool)
+
+    # stack output vectors into array
+    array = np.zeros((len(bucket), n_examples), dtype=np.int64)
+    for row in np.flatnonzero(mask):
+        array[row] = vectors[row]
+
+    bank.arrays[key] = (array, mask)
+    return bank.arrays[key]
+
+
+# GENERATE CANDIDATE PROGRAMS
+def vectorized_candidates(bank, op, partition, complete = False, rows = None):
+    '''
+    Generate candidate programs of a binary operator whose children are drawn from the buckets given by
+    a weight partition, in the same order as ProgramBank.partition_children(). If rows is provided, only
+    the rows of the first bucket in this range are used.
+
+    For each pair of buckets, the operator is applied to all pairs of rows at once with broadcasting.
+    Output vectors that repeat an earlier output vector in the same block, or that are already in the
+    signature table of the bank, are skipped without constructing a program, and the output vector of
+    every other program is cached on the program. Pairs that cannot be evaluated by NumPy (e.g., due to
+    division by zero, or where the defined_vectorized() method of the operator is False for any example)
+    are yielded without a cached output vector, to be evaluated in Python.
+    '''
+
+    # retrieve buckets and bucket arrays
+    key_a, key_b = zip(op.arg_types, partition)
+    bucket_a, bucket_b = bank.buckets[key_a], bank.buckets[key_b]
+    array_a, mask_a = bucket_array(bank, key_a)
+    array_b, mask_b = bucket_array(bank, key_b)
+    n_examples = array_a.shape[1]
+    target = np.array(bank.target)
+    if rows is None:
+        rows = range(len(bucket_a))
+
+    # evaluate the rows of the first bucket in chunks to bound the size of each block
+    chunk_size = max(1, MAX_BLOCK_SIZE // max(1, len(bucket_b) * n_examples))
+    for start in range(rows.start, rows.stop, chunk_size):
+        stop = min(start + chunk_size, rows.stop)
+        rows_a = np.arange(start, stop)[:, None]
+        rows_b = np.arange(len(bucket_b))[None, :]
+
+        # select pairs in the same way as ProgramBank.partition_children()
+        selected = np.ones((stop - start, len(bucket_b)), dtype=bool)
+        if key_a == key_b and not (complete and not op.commutative):
+            selected = (rows_a <= rows_b) if complete else (rows_a < rows_b)
+
+        # apply operator to all pairs of rows in a single broadcasted operation
+        with np.errstate(all='ignore'):
+            block = op.evaluate_vectorized(array_a[start:stop, None, :], array_b[None, :, :])
+
+        # pairs are evaluated by NumPy if both rows are vectorized and all outputs are finite and defined
+        vectorized = selected & mask_a[start:stop, None] & mask_b[None, :]
+        if block.dtype.kind == 'f':
+            vectorized &= np.isfinite(block).all(axis=2)
+        if hasattr(op, "defined_vectorized"):
+            vectorized &= op.defined_vectorized(array_a[start:stop, None, :], array_b[None, :, :]).all(axis=2)
+        fallback = selected & ~vectorized
+
+        # keep the first occurrence of each output vector within the block, as well as every
+        # output vector that satisfies the examples, as each is a distinct solution
+        block = block.reshape(-1, n_examples)
+        indices = np.flatnonzero(vectorized)
+        _, keep = np.unique(block[indices], axis=0, return_index=True)
+        if target.dtype.kind in 'iuf':
+            keep = np.union1d(keep, np.flatnonzero((block[indices] == target).all(axis=1)))
+        indices = indices[np.sort(keep)]
+        outputs = dict(zip(indices.tolist(), block[indices].tolist()))
+
+        # yield candidates in row-major order
+        for index in np.union1d(indices, np.flatnonzero(fallback)).tolist():
+            i, j = divmod(index, len(bucket_b))
+            children = (bucket_a[start + i], bucket_b[j])
+
+            # evaluate pair in Python if it could not be evaluated by NumPy
+            if index not in outputs:
+                yield OperatorNode(op, children)
+                continue
+
+            # skip output vectors already in the program bank, unless they satisfy the examples
+            signature = tuple(outputs[index])
+            if signature in bank.signatures and signature != bank.target:
+                continue
+
+            program = OperatorNode(op, children)
+            program.values = signature
+            yield program